@@ -105,18 +105,207 @@ async def delete_book(book_title: str):
 
 '''
 # Complete Application ------------------------------------------------------<<<<<<<------------------|||
-from fastapi import FastAPI, Body
+import bisect
+import os
+import threading
+from fastapi import FastAPI, Body, HTTPException
+from persistence import OpLog
 
 app = FastAPI()
 
-BOOKS = [
+BOOK_FIELDS = ("title", "author", "category")
+
+
+# BookStore: books + casefolded hash indexes (title, author, category, author+category)
+# Har request pe poori list scan + casefold ki jagah dict lookup: title O(1), category/author O(k)
+# Indexes create/update/delete pe hi update hote hain, is liye lakhon books load kar sakte hain
+# log (persistence.OpLog) diya ho to har write disk pe bhi jata hai aur startup pe wahan se load
+# Writes threadpool mein chalte hain, reads event loop pe: memory sirf self.lock ke andar badalti
+# aur parhi jati hai (lock sirf dict copy tak, I/O ke dauran nahi)
+class BookStore:
+    def __init__(self, books=(), log=None):
+        self.lock = threading.RLock()
+        self._log = log
+        self.clear()
+        if log is None:
+            self._seed(books)
+        else:
+            log.attach(self, seed=lambda: self._seed(books))
+
+    def _seed(self, books):
+        for book in books:
+            self.add(book)
+
+    def clear(self):
+        self._books = {}      # internal id -> book dict (insertion order = list order)
+        self.next_id = 0
+        # key -> {id: None}  (ordered set, id order = list order: pehla match wahi jo list scan mein milta)
+        self._by_title = {}
+        self._by_author = {}
+        self._by_category = {}
+        self._by_author_category = {}
+        self._indexes = (self._by_title, self._by_author, self._by_category, self._by_author_category)
+
+    @staticmethod
+    def check(book):
+        # Log mein sirf wahi book jaye jo replay pe index ho sake -- warna har restart replay pe fail
+        if not isinstance(book, dict) or not all(isinstance(book.get(field, ""), str) for field in BOOK_FIELDS):
+            raise ValueError("Book must be an object with string title, author and category")
+
+    @staticmethod
+    def _keys(book):
+        # _indexes ki tarteeb mein
+        author = str(book.get("author") or "").casefold()
+        category = str(book.get("category") or "").casefold()
+        return str(book.get("title") or "").casefold(), author, category, (author, category)
+
+    @staticmethod
+    def _insert(index, key, book_id):
+        # Nayi book ki id sab se bari hoti hai -> seedha end pe. Update mein key badli ho to
+        # book ko uski id wali jagah pe daalo (ids sirf barhti hain, to sorted insert)
+        ids = index.get(key)
+        if ids is None:
+            index[key] = {book_id: None}
+        elif book_id > next(reversed(ids)):
+            ids[book_id] = None
+        else:
+            ordered = list(ids)
+            bisect.insort(ordered, book_id)
+            index[key] = dict.fromkeys(ordered)
+
+    @staticmethod
+    def _discard(index, key, book_id):
+        ids = index[key]
+        del ids[book_id]
+        if not ids:
+            del index[key]
+
+    def _index(self, book_id, keys):
+        for index, key in zip(self._indexes, keys):
+            self._insert(index, key, book_id)
+
+    def _unindex(self, book_id, book):
+        for index, key in zip(self._indexes, self._keys(book)):
+            self._discard(index, key, book_id)
+
+    def _first_id(self, title):
+        ids = self._by_title.get(title.casefold())
+        return next(iter(ids)) if ids else None
+
+    # OpLog ke liye: log/snapshot records memory pe lagana aur poori state nikalna
+    def apply(self, op, book_id, book):
+        if op == "put":
+            # Keys pehle: galat book pe yahin exception, store ki koi cheez badle baghair
+            keys = self._keys(book)
+            old = self._books.get(book_id)
+            self._books[book_id] = book
+            if old is None:
+                self._index(book_id, keys)
+                return
+            # Update: jo key nahi badli us bucket ko haath nahi lagate (position wahi rehti hai)
+            for index, old_key, new_key in zip(self._indexes, self._keys(old), keys):
+                if old_key != new_key:
+                    self._discard(index, old_key, book_id)
+                    self._insert(index, new_key, book_id)
+        elif book_id in self._books:
+            self._unindex(book_id, self._books.pop(book_id))
+
+    def dump(self):
+        return self._books.items()
+
+    def _sync(self):
+        if self._log is not None:
+            self._log.sync()
+
+    def _writing(self):
+        # Log na ho to writers aapas mein (next_id) memory lock se hi alag
+        return self.lock if self._log is None else self._log.writing()
+
+    def _commit(self, op, book_id, book=None):
+        # Pehle log (append + fsync), phir memory
+        if op == "put":
+            self.check(book)
+        if self._log is not None:
+            self._log.append(op, book_id, book)
+        with self.lock:
+            self.apply(op, book_id, book)
+
+    def __len__(self):
+        self._sync()
+        return len(self._books)
+
+    def __iter__(self):
+        return iter(self.all())
+
+    def all(self):
+        self._sync()
+        with self.lock:
+            return list(self._books.values())
+
+    def add(self, book):
+        with self._writing():
+            book_id = self.next_id
+            self._commit("put", book_id, book)
+            self.next_id = book_id + 1
+
+    def by_title(self, title):
+        self._sync()
+        with self.lock:
+            book_id = self._first_id(title)
+            return None if book_id is None else self._books[book_id]
+
+    def by_category(self, category):
+        self._sync()
+        with self.lock:
+            return [self._books[i] for i in self._by_category.get(category.casefold(), ())]
+
+    def by_author(self, author):
+        self._sync()
+        with self.lock:
+            return [self._books[i] for i in self._by_author.get(author.casefold(), ())]
+
+    def by_author_and_category(self, author, category):
+        self._sync()
+        key = (author.casefold(), category.casefold())
+        with self.lock:
+            return [self._books[i] for i in self._by_author_category.get(key, ())]
+
+    def replace(self, title, book):
+        # Pehli matching book ki jagah nayi (list mein position wahi rehti hai)
+        with self._writing():
+            book_id = self._first_id(title)
+            if book_id is None:
+                return False
+            self._commit("put", book_id, book)
+            return True
+
+    def remove(self, title):
+        with self._writing():
+            book_id = self._first_id(title)
+            if book_id is None:
+                return False
+            self._commit("del", book_id)
+            return True
+
+
+# BOOKS_DATA_DIR set ho to books wahan persist hote hain (restart ke baad bhi, aur ek hi directory
+# wale saare workers same data dekhte hain). BOOKS_FSYNC=0: har write pe fsync nahi (tez, lekin
+# machine crash pe aakhri writes ja sakti hain).
+def open_log():
+    directory = os.environ.get("BOOKS_DATA_DIR")
+    if not directory:
+        return None
+    return OpLog(directory, fsync=os.environ.get("BOOKS_FSYNC", "1") != "0")
+
+
+BOOKS = BookStore([
     {"title": "Title One", "author": "Author One", "category": "science"},
     {"title": "Title Two", "author": "Author Two", "category": "science"},
     {"title": "Title Three", "author": "Author Three", "category": "history"},
     {"title": "Title Four", "author": "Author Four", "category": "math"},
     {"title": "Title Five", "author": "Author Five", "category": "math"},
     {"title": "Title Six", "author": "Author Two", "category": "math"}
-]
+], log=open_log())
 
 # Root endpoint
 @app.get("/")
@@ -126,7 +315,7 @@ async def root():
 # Get all books
 @app.get("/books")
 async def read_all_books():
-    return BOOKS
+    return BOOKS.all()
 
 # Static route - must come before dynamic route
 @app.get("/books/my-book")
@@ -136,52 +325,49 @@ async def read_favorite_book():
 # Get book by title
 @app.get("/books/{book_title}")
 async def read_book_by_title(book_title: str):
-    for book in BOOKS:
-        if book.get("title").casefold() == book_title.casefold():
-            return book
+    book = BOOKS.by_title(book_title)
+    if book is not None:
+        return book
     return {"message": "Book not found"}
 
 # Get books by category (query parameter)
 @app.get("/books/")
 async def read_books_by_category(category: str):
-    books_to_return = []
-    for book in BOOKS:
-        if book.get('category').casefold() == category.casefold():
-            books_to_return.append(book)
-    return books_to_return
+    return BOOKS.by_category(category)
 
 # Get books by author and category
 @app.get("/books/author/{book_author}")
 async def read_books_by_author_and_category(book_author: str, category: str):
-    books_to_return = []
-    for book in BOOKS:
-        if (book.get('author').casefold() == book_author.casefold() and
-            book.get('category').casefold() == category.casefold()):
-            books_to_return.append(book)
-    return books_to_return
+    return BOOKS.by_author_and_category(book_author, category)
+
+def valid_book(book):
+    # Body() koi bhi JSON le leta hai: galat shape pe 422, store/log tak nahi jati
+    try:
+        BookStore.check(book)
+    except ValueError as error:
+        raise HTTPException(status_code=422, detail=str(error))
+    return book
+
+# Writes plain def: FastAPI inhe threadpool mein chalata hai, file lock aur fsync event loop ko
+# nahi rokte (reads async hi hain, woh memory se hain)
 
 # Create new book
 @app.post("/books/create_book")
-async def create_book(new_book=Body()):
-    BOOKS.append(new_book)
+def create_book(new_book=Body()):
+    BOOKS.add(valid_book(new_book))
     return {"message": "Book created successfully"}
 
 # Update book
 @app.put("/books/update_book")
-async def update_book(updated_book=Body()):
-    for i in range(len(BOOKS)):
-        if BOOKS[i]["title"].casefold() == updated_book["title"].casefold():
-            BOOKS[i] = updated_book
-            return {"message": "Book updated successfully"}
+def update_book(updated_book=Body()):
+    updated_book = valid_book(updated_book)
+    if BOOKS.replace(updated_book.get("title", ""), updated_book):
+        return {"message": "Book updated successfully"}
     return {"message": "Book not found"}
 
 # Delete book
 @app.delete("/books/delete_book/{book_title}")
-async def delete_book(book_title: str):
-    for i in range(len(BOOKS)):
-        if BOOKS[i]["title"].casefold() == book_title.casefold():
-            BOOKS.pop(i)
-            return {"message": "Book deleted successfully"}
+def delete_book(book_title: str):
+    if BOOKS.remove(book_title):
+        return {"message": "Book deleted successfully"}
     return {"message": "Book not found"}
-
-
@@ -0,0 +1,84 @@
+"""Kai workers ek hi BOOKS_DATA_DIR pe: sab ke writes restart (log replay) ke baad bhi hon.
+
+Project folder se chalao:
+
+    python check_workers.py --workers 4 --books 400
+
+Har worker apni books add karta hai, kuch ki category badalta hai aur kuch delete karta hai.
+compact_every chhota hai taake beech mein bohat si compactions (doosre workers ke likhte hue)
+hon. Aakhir mein ek naya store directory se load hota hai aur har worker ki expected state se
+milaya jata hai. Farq ho to exit code 1.
+"""
+import argparse
+import subprocess
+import sys
+import tempfile
+
+from books import BookStore
+from persistence import OpLog
+
+
+def open_store(directory, compact_every):
+    return BookStore([], log=OpLog(directory, compact_every=compact_every, fsync=False))
+
+
+def expected_books(worker, count):
+    # Worker kya chhod ke jata hai: har 4th book delete, har 3rd ki category "updated"
+    books = {}
+    for n in range(count):
+        if n % 4 == 0:
+            continue
+        books[f"w{worker}-{n}"] = "updated" if n % 3 == 0 else "new"
+    return books
+
+
+def run_worker(directory, worker, count, compact_every):
+    store = open_store(directory, compact_every)
+    failures = 0
+    for n in range(count):
+        title = f"w{worker}-{n}"
+        store.add({"title": title, "author": f"worker {worker}", "category": "new"})
+        if n % 3 == 0 and not store.replace(title, {"title": title, "author": f"worker {worker}", "category": "updated"}):
+            failures += 1
+        if n % 4 == 0 and not store.remove(title):
+            failures += 1
+    if store._log._compactor is not None:
+        store._log._compactor.join()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--books", type=int, default=400, help="har worker ki books")
+    parser.add_argument("--compact-every", type=int, default=50)
+    parser.add_argument("--data-dir", help="default: nayi temp directory")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        sys.exit(1 if run_worker(args.data_dir, args.worker, args.books, args.compact_every) else 0)
+
+    directory = args.data_dir or tempfile.mkdtemp(prefix="books-data-")
+    command = [sys.executable, __file__, "--data-dir", directory, "--books", str(args.books),
+               "--compact-every", str(args.compact_every)]
+    workers = [subprocess.Popen(command + ["--worker", str(worker)]) for worker in range(args.workers)]
+    failed = [worker for worker, process in enumerate(workers) if process.wait() != 0]
+
+    expected = {}
+    for worker in range(args.workers):
+        expected.update(expected_books(worker, args.books))
+    replayed = {book["title"]: book["category"] for book in open_store(directory, args.compact_every).all()}
+
+    missing = expected.keys() - replayed.keys()
+    extra = replayed.keys() - expected.keys()
+    wrong = [title for title in expected.keys() & replayed.keys() if expected[title] != replayed[title]]
+    print(f"{directory}: {len(replayed):,} books after replay, {len(expected):,} expected")
+    print(f"   missing {len(missing)}, unexpected {len(extra)}, wrong category {len(wrong)}, "
+          f"workers with failed update/delete {failed}")
+    if missing or extra or wrong or failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
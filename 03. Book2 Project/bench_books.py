@@ -0,0 +1,84 @@
+"""Book record ki memory aur /books serialization, 1M books pe.
+
+Project folder se chalao:
+
+    python bench_books.py --books 1000000
+
+Memory: purana plain class (har instance ka __dict__) vs slotted Book.
+Serialization: jsonable_encoder (bina response_model ke FastAPI yahi karta tha),
+response_model validation + dump (TypeAdapter), aur book.serialize_books.
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from book import Book, BookResponse, serialize_books
+
+
+class DictBook:
+    # Pehle wala Book: same fields, __slots__ ke baghair
+    def __init__(self, id, title, author, description, rating):
+        self.id = id
+        self.title = title
+        self.author = author
+        self.description = description
+        self.rating = rating
+
+
+def make(cls, count):
+    # Strings shared hain (jaise asal catalog mein bhi zyada tar repeat hoti hain) taake
+    # farq sirf record layout ka dikhe
+    titles = [f"Book title {n}" for n in range(1000)]
+    return [cls(n, titles[n % 1000], "Coding with Ruby", "A very nice book", n % 5 + 1) for n in range(1, count + 1)]
+
+
+def measure_memory(cls, count):
+    gc.collect()
+    tracemalloc.start()
+    items = make(cls, count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return items, size
+
+
+def timed(label, fn, repeat):
+    best = min(_once(fn) for _ in range(repeat))
+    print(f"   {label:<36} {best * 1e3:>9,.0f} ms")
+    return best
+
+
+def _once(fn):
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"memory for {args.books:,} records (tracemalloc, list included):")
+    dict_books, dict_size = measure_memory(DictBook, args.books)
+    slotted_books, slotted_size = measure_memory(Book, args.books)
+    print(f"   plain class (__dict__)   {dict_size / 2**20:>9,.1f} MiB")
+    print(f"   slotted Book             {slotted_size / 2**20:>9,.1f} MiB   ({slotted_size / dict_size:.0%})")
+
+    adapter = TypeAdapter(List[BookResponse])
+    print(f"serializing {args.books:,} books to JSON bytes (best of {args.repeat}):")
+    timed("jsonable_encoder + json.dumps", lambda: json.dumps(jsonable_encoder(dict_books)).encode(), args.repeat)
+    timed("response_model (TypeAdapter)", lambda: adapter.dump_json(adapter.validate_python(slotted_books, from_attributes=True)), args.repeat)
+    timed("serialize_books", lambda: serialize_books(slotted_books), args.repeat)
+
+    assert json.loads(serialize_books(slotted_books[:3])) == jsonable_encoder(dict_books[:3])
+
+
+if __name__ == "__main__":
+    main()
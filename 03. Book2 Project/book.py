@@ -1,10 +1,20 @@
-from fastapi import FastAPI,Path,Query,HTTPException
+import bisect
+import os
+import threading
+from operator import attrgetter
+from fastapi import FastAPI,Path,Query,HTTPException,Response
 from pydantic import BaseModel,Field
-from typing import Optional
+from pydantic_core import to_json
+from typing import List, Optional
 from starlette import status
+from persistence import OpLog
 app = FastAPI()
 
 class Book:
+    # __slots__ (00. pythonRefresher/enemy.py jaisa): har instance ka __dict__ nahi, sirf
+    # fixed fields -> lakhon books mein memory kaafi kam, attribute access bhi tez
+    __slots__ = ['id', 'title', 'author', 'description', 'rating']
+
     id: int
     title: str
     author: str
@@ -41,78 +51,234 @@ class BookRequest(BaseModel):
 
 
 
-books = [
+# BookStore: id -> Book dict (insertion order = id order, kyunke ids sirf barhte hain)
+# + rating -> {id: None} index. Read/update/delete sab O(1), list scan/pop ki zaroorat nahi.
+# Ids monotonic counter se aate hain: aakhri book delete ho to bhi uski id dobara nahi milti.
+class BookStore:
+    # log (persistence.OpLog) diya ho to har write disk pe bhi jata hai aur startup pe wahan se load
+    # Writes threadpool mein chalte hain, reads event loop pe: memory sirf self.lock ke andar badalti
+    # aur parhi jati hai (lock sirf dict copy tak, I/O ke dauran nahi)
+    def __init__(self, books=(), log=None):
+        self.lock = threading.RLock()
+        self._log = log
+        self.clear()
+        if log is None:
+            self._seed(books)
+        else:
+            log.attach(self, seed=lambda: self._seed(books))
+
+    def _seed(self, books):
+        # Seed books apni di hui ids ke sath
+        with self._writing():
+            for book in books:
+                self.next_id = max(self.next_id, book.id + 1)
+                self._commit("put", book)
+
+    def clear(self):
+        self._books = {}
+        self._by_rating = {}
+        self.next_id = 1
+
+    def _put(self, book):
+        old = self._books.get(book.id)
+        self._books[book.id] = book
+        if old is not None:
+            if old.rating == book.rating:
+                return  # rating wahi -> index mein position bhi wahi
+            self._unindex(old)
+        # Rating bucket id order mein: nayi book (sab se bari id) end pe, rating badli ho to
+        # sorted jagah pe
+        ids = self._by_rating.get(book.rating)
+        if ids is None:
+            self._by_rating[book.rating] = {book.id: None}
+        elif book.id > next(reversed(ids)):
+            ids[book.id] = None
+        else:
+            ordered = list(ids)
+            bisect.insort(ordered, book.id)
+            self._by_rating[book.rating] = dict.fromkeys(ordered)
+
+    def _unindex(self, book):
+        ids = self._by_rating[book.rating]
+        del ids[book.id]
+        if not ids:
+            del self._by_rating[book.rating]
+
+    # OpLog ke liye: disk pe book [title, author, description, rating] list hai, id key mein
+    def apply(self, op, book_id, data):
+        if op == "put":
+            self._put(Book(book_id, *data))
+        elif book_id in self._books:
+            self._unindex(self._books.pop(book_id))
+
+    def dump(self):
+        return ((book_id, [book.title, book.author, book.description, book.rating])
+                for book_id, book in self._books.items())
+
+    def _sync(self):
+        if self._log is not None:
+            self._log.sync()
+
+    def _writing(self):
+        # Log na ho to writers aapas mein (next_id) memory lock se hi alag
+        return self.lock if self._log is None else self._log.writing()
+
+    def _commit(self, op, book):
+        # Pehle log (append + fsync), phir memory
+        if op == "put":
+            if self._log is not None:
+                self._log.append("put", book.id, [book.title, book.author, book.description, book.rating])
+            with self.lock:
+                self._put(book)
+        else:
+            if self._log is not None:
+                self._log.append("del", book.id)
+            with self.lock:
+                self._unindex(self._books.pop(book.id))
+
+    def __len__(self):
+        self._sync()
+        return len(self._books)
+
+    def __iter__(self):
+        return iter(self.all())
+
+    def all(self):
+        self._sync()
+        with self.lock:
+            return list(self._books.values())
+
+    def get(self, book_id):
+        self._sync()
+        return self._books.get(book_id)
+
+    def by_rating(self, rating):
+        self._sync()
+        with self.lock:
+            return [self._books[i] for i in self._by_rating.get(rating, ())]
+
+    def allocate_id(self):
+        book_id = self.next_id
+        self.next_id += 1
+        return book_id
+
+    def add(self, book):
+        with self._writing():
+            book.id = self.allocate_id()
+            self._commit("put", book)
+            return book
+
+    def replace(self, book):
+        # Book dict mein apni jagah pe rehti hai, sirf rating index badalta hai
+        with self._writing():
+            if book.id not in self._books:
+                return False
+            self._commit("put", book)
+            return True
+
+    def remove(self, book_id):
+        with self._writing():
+            book = self._books.get(book_id)
+            if book is None:
+                return False
+            self._commit("del", book)
+            return True
+
+
+# BOOK2_DATA_DIR set ho to books wahan persist hote hain (restart ke baad bhi, aur ek hi directory
+# wale saare workers same data dekhte hain). BOOK2_FSYNC=0: har write pe fsync nahi (tez, lekin
+# machine crash pe aakhri writes ja sakti hain).
+def open_log():
+    directory = os.environ.get("BOOK2_DATA_DIR")
+    if not directory:
+        return None
+    return OpLog(directory, fsync=os.environ.get("BOOK2_FSYNC", "1") != "0")
+
+
+class BookResponse(BaseModel):
+    id: int
+    title: str
+    author: str
+    description: str
+    rating: int
+
+    model_config = {"from_attributes": True}   # slotted Book seedha validate ho jata hai
+
+
+# List responses ka precompiled serializer: fields ek attrgetter se ek hi call mein, phir
+# pydantic_core.to_json (Rust encoder, json.dumps se ~3x tez; compact UTF-8 JSON).
+# Slotted Book ka __dict__ nahi hota, to jsonable_encoder har book ko introspect karne ki jagah
+# yahan se guzarte hain (response_model sirf docs/schema ke liye).
+BOOK_FIELDS = tuple(Book.__slots__)
+_book_values = attrgetter(*BOOK_FIELDS)
+
+
+def serialize_books(items) -> bytes:
+    return to_json([dict(zip(BOOK_FIELDS, _book_values(book))) for book in items])
+
+
+def books_response(items) -> Response:
+    return Response(serialize_books(items), media_type="application/json")
+
+
+books = BookStore([
     Book(1, "Computer Science Pro", "Coding with Ruby", "A very nice book", 5),
     Book(2, "Be Fast with FastAPI", "Coding with Ruby", "This is a great book", 5),
     Book(3, "Master Endpoints", "Coding with Ruby", "This is an awesome book", 5),
     Book(4, "HP1", "Author One", "Book description", 2),
     Book(5, "HP2", "Author Two", "Book description", 3),
     Book(6, "HP3", "Author Three", "Book description", 1)
-]
+], log=open_log())
 
 
 @app.get("/")
 async def root():
     return {"message": "Books Application"}
 
-@app.get("/books",status_code=status.HTTP_200_OK)
+@app.get("/books",status_code=status.HTTP_200_OK, response_model=List[BookResponse])
 async def read_all_books():
-    return books
+    return books_response(books.all())
 
-@app.get("/book/{book_id}",status_code=status.HTTP_200_OK)
+@app.get("/book/{book_id}",status_code=status.HTTP_200_OK, response_model=BookResponse)
 async def read_book(book_id:int= Path(gt=0)):
-    for book in books:
-        if (book.id==book_id):
-            return book
+    book = books.get(book_id)
+    if book is not None:
+        return book
         
     raise HTTPException(status_code=404, detail="Item not found")
 
-@app.get("/books/",status_code=status.HTTP_200_OK)
+@app.get("/books/",status_code=status.HTTP_200_OK, response_model=List[BookResponse])
 async def read_book_by_rating(book_rating: int= Query(gt=0, lt=6)):
-    books_to_return = []
-    for book in books:
-        if book.rating == book_rating:
-            books_to_return.append(book)
-    return books_to_return
+    return books_response(books.by_rating(book_rating))
 
     
 
 
-def find_book_id(book):
-    book.id = 1 if len(books) == 0 else books[-1].id + 1
-    return book
-
-
+# Writes plain def: FastAPI inhe threadpool mein chalata hai, file lock aur fsync event loop ko
+# nahi rokte (reads async hi hain, woh memory se hain)
 @app.post("/create-book",status_code=status.HTTP_201_CREATED)
-async def create_book(book_request: BookRequest):
+def create_book(book_request: BookRequest):
     # Convert BookRequest to Book object
     new_book = Book(**book_request.model_dump())  # or .model_dump() for Pydantic v2
 
-    # Auto-assign ID
-    new_book = find_book_id(new_book)
-
-    # Add to books list
-    books.append(new_book)
+    # Add to store (id store khud assign karta hai)
+    books.add(new_book)
 
 
 
 
 
 @app.put("/books/{book_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def update_book( book_request: BookRequest,book_id: int = Path(gt=0)):
-    for i in range(len(books)):
-        if books[i].id == book_id:
-            updated_book = Book(**book_request.model_dump())
-            updated_book.id = book_id
-            books[i] = updated_book
-            return
+def update_book( book_request: BookRequest,book_id: int = Path(gt=0)):
+    updated_book = Book(**book_request.model_dump())
+    updated_book.id = book_id
+    if books.replace(updated_book):
+        return
     
     raise HTTPException(status_code=404, detail="Item not found")
 
 @app.delete("/books/{book_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_book(book_id: int = Path(gt=0)):
-    for i in range(len(books)):
-        if books[i].id == book_id:
-            books.pop(i)
-            return
+def delete_book(book_id: int = Path(gt=0)):
+    if books.remove(book_id):
+        return
     raise HTTPException(status_code=404, detail="Item not found")  # Outside loop
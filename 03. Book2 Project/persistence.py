@@ -0,0 +1,272 @@
+import gc
+import os
+import threading
+from contextlib import contextmanager
+from itertools import islice
+from pydantic_core import from_json, to_json
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+SNAPSHOT_CHUNK = 1000  # snapshot itni items ke tukdon mein likhi jati hai (neeche compact dekho)
+
+# In-memory book store ke liye optional persistence (data directory set ho to):
+#   snapshot.json        -> {"seq", "next_id", "items": [[key, data], ...]} poori state, ek JSON
+#   ops-<seq>.log        -> snapshot ke baad har create/update/delete ek line: [seq, op, key, data]
+#   lock                 -> writers ka file lock (kai workers ek hi directory use kar sakte hain)
+#
+# Startup: snapshot load + log replay. Har write pehle log mein (append + fsync), phir memory mein.
+# Log jab live books jitna lamba ho jaye (kam az kam compact_every records) to poori state nayi
+# snapshot mein aur naya khali log -- snapshot likhna O(n) hai, is liye har n writes pe ek dafa,
+# aur woh bhi background thread mein (request ke raste mein nahi).
+# Reads memory se hi hote hain; har read se pehle ek os.stat se doosre workers ki nayi log lines
+# apply ho jati hain (log rotate hua ho to marker se naye log pe).
+#
+# Threads: writes (file lock, fsync) event loop pe nahi chalne chahiye -- routes plain def hain,
+# FastAPI unhe threadpool mein chalata hai. Lock order: pehle OpLog ka lock, phir store.lock.
+#
+# Store ko yeh dena hota hai: lock (RLock, memory ke reads/writes), next_id, clear(),
+# apply(op, key, data), dump() -> (key, data) pairs.
+# Keys int ids hain jo sirf barhte hain, is liye replay idempotent hai.
+
+
+class OpLog:
+    def __init__(self, directory: str, compact_every: int = 10000, fsync: bool = True):
+        self.directory = directory
+        self.compact_every = compact_every
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+        self._snapshot_path = os.path.join(directory, "snapshot.json")
+        self._lock_path = os.path.join(directory, "lock")
+        self._lock_file = None
+        self._lock_depth = 0
+        self._thread_lock = threading.RLock()  # isi process ke threads (threadpool writers, compaction)
+        self._compactor = None
+        self.store = None
+        self.seq = 0            # aakhri applied record
+        self.snapshot_seq = 0   # current snapshot kis seq tak hai (log file ka naam bhi isi se)
+        self._snapshot_id = None
+        self._offset = 0        # current log mein kahan tak parh liya
+
+    def _log_path(self) -> str:
+        return os.path.join(self.directory, f"ops-{self.snapshot_seq:012d}.log")
+
+    def _stat_snapshot(self):
+        try:
+            stat = os.stat(self._snapshot_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    @contextmanager
+    def _locked(self):
+        # Pehle thread lock, phir file lock (doosre workers). Reentrant: attach ke seed ke dauran
+        # store ke writes bhi isi lock mein
+        with self._thread_lock:
+            if self._lock_depth == 0:
+                self._lock_file = open(self._lock_path, "a+b")
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+                else:
+                    self._lock_file.seek(0)
+                    msvcrt.locking(self._lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    self._lock_file.close()  # close se lock bhi chhoot jata hai
+                    self._lock_file = None
+
+    def _apply(self, seq: int, op: str, key: int, data):
+        if seq <= self.seq:
+            return
+        self.store.apply(op, key, data)
+        if op == "put":
+            self.store.next_id = max(self.store.next_id, key + 1)
+        self.seq = seq
+
+    def _load_snapshot(self):
+        self.store.clear()
+        self.seq = self.snapshot_seq = 0
+        self._offset = 0
+        self._snapshot_id = self._stat_snapshot()
+        try:
+            with open(self._snapshot_path, "rb") as f:
+                snapshot = from_json(f.read())
+        except FileNotFoundError:
+            return
+        self.store.next_id = snapshot["next_id"]
+        for key, data in snapshot["items"]:
+            self.store.apply("put", key, data)
+        self.seq = self.snapshot_seq = snapshot["seq"]
+
+    def _read_log(self) -> bool:
+        # False: current log hai hi nahi (hum do compactions peeche) -> snapshot se reload
+        while True:
+            try:
+                with open(self._log_path(), "rb") as f:
+                    f.seek(self._offset)
+                    chunk = f.read()
+            except FileNotFoundError:
+                return False
+            # Adhoori aakhri line (koi writer abhi likh raha hai) agli dafa
+            end = chunk.rfind(b"\n") + 1
+            rotated = None
+            with self.store.lock:
+                for line in chunk[:end].splitlines():
+                    seq, op, key, data = from_json(line)
+                    if op == "rotate":
+                        rotated = seq
+                        break
+                    self._apply(seq, op, key, data)
+            if rotated is None:
+                self._offset += end
+                return True
+            # Compaction: snapshot is seq tak hai aur hum bhi -> baaki records naye log mein
+            self.snapshot_seq = rotated
+            self._snapshot_id = self._stat_snapshot()
+            self._offset = 0
+
+    @contextmanager
+    def _bulk_load(self):
+        # Lakhon naye dict/list objects: beech mein cyclic GC baar baar poora heap scan karta hai
+        # (1M books pe load time ~3x). Load ke dauran band, baad mein pehle wali halat.
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            yield
+        finally:
+            if enabled:
+                gc.enable()
+
+    def _reload(self):
+        # Snapshot parhte waqt doosra worker compact kar de to purana log khatam ho chuka -> dobara
+        with self.store.lock, self._bulk_load():
+            while True:
+                self._load_snapshot()
+                if self._read_log():
+                    return
+
+    def attach(self, store, seed=None):
+        # Startup: disk se state load; directory bilkul khali ho to seed() (lock ke andar, taake
+        # ek saath start hone wale workers do dafa seed na karein)
+        self.store = store
+        with self._locked():
+            log_path = self._load_existing()
+            # Crash se bachi adhoori aakhri line kaat do
+            if os.path.getsize(log_path) > self._offset:
+                with open(log_path, "r+b") as f:
+                    f.truncate(self._offset)
+            # Pichhli compaction ka log, ya compaction beech mein crash hui ho to purane logs
+            self._remove_logs(keep=(log_path,))
+            if self.seq == 0 and seed is not None:
+                seed()
+
+    def _load_existing(self) -> str:
+        with self.store.lock, self._bulk_load():
+            self._load_snapshot()
+            log_path = self._log_path()
+            open(log_path, "ab").close()
+            self._read_log()
+        return log_path
+
+    def _remove_logs(self, keep):
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith("ops-") and name.endswith(".log") and path not in keep:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass  # Windows pe koi aur process khola hua ho; agla attach saaf kar dega
+
+    def sync(self):
+        # Har read se pehle: ek stat, log barha ho to sirf nayi lines. Isi process ka koi thread
+        # likh ya compact kar raha ho to intezar nahi (event loop ruk jata): uske writes memory mein
+        # pehle se hain, doosre workers ke records agli read pe
+        if not self._thread_lock.acquire(blocking=False):
+            return
+        try:
+            try:
+                size = os.stat(self._log_path()).st_size
+            except FileNotFoundError:
+                size = None
+            if size != self._offset and not self._read_log():
+                self._reload()
+        finally:
+            self._thread_lock.release()
+
+    def _catch_up(self):
+        # Lock ke andar: doosre workers ke saare records apply, taake hum unke baad likhein
+        self.sync()
+        if self._stat_snapshot() != self._snapshot_id:
+            self._reload()  # compaction marker ke baghair ruki: purane log mein likhna data kho dena hai
+
+    @contextmanager
+    def writing(self):
+        # Write ke liye: lock, doosre workers ke records apply (ids/titles unke baad), phir write
+        with self._locked():
+            self._catch_up()
+            yield
+            if self.seq - self.snapshot_seq >= max(self.compact_every, len(self.store)):
+                self._start_compaction()
+
+    def _start_compaction(self):
+        # Snapshot likhna O(n) hai (250k books pe ~650 ms): alag thread jo khud lock leta hai.
+        # Us dauran writes threadpool mein intezar karte hain, reads memory se chalte rehte hain.
+        if self._compactor is None or not self._compactor.is_alive():
+            self._compactor = threading.Thread(target=self.compact, name="oplog-compact", daemon=True)
+            self._compactor.start()
+
+    def append(self, op: str, key: int, data=None):
+        seq = self.seq + 1
+        line = to_json([seq, op, key, data]) + b"\n"
+        with open(self._log_path(), "ab") as f:
+            f.write(line)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        self.seq = seq
+        self._offset += len(line)
+
+    def compact(self):
+        # Lock ke andar. Order aham hai: naya log pehle, phir snapshot replace (atomic), phir purane
+        # log mein "rotate" marker -> kisi bhi waqt padhne wale ko snapshot + uska log mil jata hai,
+        # aur purane log ko tail karne wale marker se naye log pe chale jate hain
+        with self._locked():
+            # Pichhle sync ke baad doosre workers ne jo likha woh bhi snapshot mein aaye -- warna
+            # snapshot purane seq pe banti aur unke records purane log ke saath mit jate
+            self._catch_up()
+            if self.seq == self.snapshot_seq:
+                return
+            old_log = self._log_path()
+            # Store ko sirf is lock wale badalte hain (writes aur sync), to store.lock ke baghair
+            # dump -- reads rukte nahi. Poori catalog ka ek to_json GIL ~250 ms (250k books) pakad
+            # leta hai aur event loop thread bhi ruk jata; tukdon ke beech doosre threads ki baari
+            items = iter(self.store.dump())
+            tmp_path = self._snapshot_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(b'{"seq":%d,"next_id":%d,"items":[' % (self.seq, self.store.next_id))
+                separator = b""
+                while True:
+                    chunk = list(islice(items, SNAPSHOT_CHUNK))
+                    if not chunk:
+                        break
+                    f.write(separator + to_json(chunk)[1:-1])
+                    separator = b","
+                f.write(b"]}")
+                f.flush()
+                os.fsync(f.fileno())
+            self.snapshot_seq = self.seq
+            open(self._log_path(), "ab").close()
+            os.replace(tmp_path, self._snapshot_path)
+            self._snapshot_id = self._stat_snapshot()
+            self._offset = 0
+            with open(old_log, "ab") as f:
+                f.write(to_json([self.seq, "rotate", None, None]) + b"\n")
+            # Purana log ek compaction tak rehta hai taake us pe ruka worker marker parh sake
+            self._remove_logs(keep=(old_log, self._log_path()))
@@ -3,12 +3,18 @@ from logging.config import fileConfig
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 from todoapp import models
+from todoapp.config import settings
+from todoapp.search import is_search_object
 from alembic import context
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
 
+# URL app wali settings (DATABASE_URL env) se, taake app aur migrations ek hi database pe chalein
+# (% ko %% karna zaroori hai, configparser warna usse interpolation samajhta hai)
+config.set_main_option("sqlalchemy.url", settings.database_url.replace("%", "%%"))
+
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
 fileConfig(config.config_file_name)
@@ -19,6 +25,12 @@ fileConfig(config.config_file_name)
 # target_metadata = mymodel.Base.metadata
 target_metadata = models.Base.metadata
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    # Full-text search ke objects (FTS5 table, tsvector column, GIN/FULLTEXT index) sirf
+    # migration 5d2f8a61c3b7 mein hain, models mein nahi -> autogenerate inhein drop na kare
+    return not (reflected and compare_to is None and is_search_object(object, name, type_))
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -43,6 +55,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -64,7 +77,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,30 @@
+"""add todo versions
+
+Revision ID: 12a969c9e1c2
+Revises: 9c034d8a8008
+Create Date: 2026-10-18 12:20:07.918344
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '12a969c9e1c2'
+down_revision: Union[str, Sequence[str], None] = '9c034d8a8008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('todos', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+    op.add_column('users', sa.Column('todos_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'todos_version')
+    op.drop_column('todos', 'version')
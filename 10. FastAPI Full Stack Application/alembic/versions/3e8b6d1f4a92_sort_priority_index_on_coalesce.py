@@ -0,0 +1,31 @@
+"""sort priority index on coalesce
+
+Revision ID: 3e8b6d1f4a92
+Revises: 5d2f8a61c3b7
+Create Date: 2026-10-18 18:20:37.418552
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e8b6d1f4a92'
+down_revision: Union[str, Sequence[str], None] = '5d2f8a61c3b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_todos_owner_id_sort_priority_id', 'todos',
+                    ['owner_id', sa.text('coalesce(priority, 0)'), 'id'])
+    op.drop_index('ix_todos_owner_id_priority_id', table_name='todos')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_todos_owner_id_priority_id', 'todos', ['owner_id', 'priority', 'id'])
+    op.drop_index('ix_todos_owner_id_sort_priority_id', table_name='todos')
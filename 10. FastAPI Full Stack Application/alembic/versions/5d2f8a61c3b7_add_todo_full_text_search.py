@@ -0,0 +1,72 @@
+"""add todo full text search
+
+Revision ID: 5d2f8a61c3b7
+Revises: 12a969c9e1c2
+Create Date: 2026-10-18 15:42:11.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2f8a61c3b7'
+down_revision: Union[str, Sequence[str], None] = '12a969c9e1c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute(
+            "CREATE VIRTUAL TABLE todos_fts USING fts5("
+            "title, description, owner_id, content='todos', content_rowid='id', "
+            "tokenize='porter unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        op.execute(
+            "CREATE TRIGGER todos_fts_ai AFTER INSERT ON todos BEGIN "
+            "INSERT INTO todos_fts(rowid, title, description, owner_id) "
+            "VALUES (new.id, new.title, new.description, new.owner_id); END"
+        )
+        op.execute(
+            "CREATE TRIGGER todos_fts_ad AFTER DELETE ON todos BEGIN "
+            "INSERT INTO todos_fts(todos_fts, rowid, title, description, owner_id) "
+            "VALUES ('delete', old.id, old.title, old.description, old.owner_id); END"
+        )
+        op.execute(
+            "CREATE TRIGGER todos_fts_au AFTER UPDATE OF title, description, owner_id ON todos BEGIN "
+            "INSERT INTO todos_fts(todos_fts, rowid, title, description, owner_id) "
+            "VALUES ('delete', old.id, old.title, old.description, old.owner_id); "
+            "INSERT INTO todos_fts(rowid, title, description, owner_id) "
+            "VALUES (new.id, new.title, new.description, new.owner_id); END"
+        )
+        # Maujooda todos index mein daalo
+        op.execute("INSERT INTO todos_fts(todos_fts) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        op.execute(
+            "ALTER TABLE todos ADD COLUMN search tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED"
+        )
+        op.create_index('ix_todos_search', 'todos', ['search'], postgresql_using='gin')
+    elif dialect in ('mysql', 'mariadb'):
+        op.create_index('ix_todos_fulltext', 'todos', ['title', 'description'], mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TRIGGER todos_fts_au")
+        op.execute("DROP TRIGGER todos_fts_ad")
+        op.execute("DROP TRIGGER todos_fts_ai")
+        op.execute("DROP TABLE todos_fts")
+    elif dialect == 'postgresql':
+        op.drop_index('ix_todos_search', table_name='todos')
+        op.drop_column('todos', 'search')
+    elif dialect in ('mysql', 'mariadb'):
+        op.drop_index('ix_todos_fulltext', table_name='todos')
@@ -0,0 +1,34 @@
+"""redesign todo indexes
+
+Revision ID: 9c034d8a8008
+Revises: c79f94d437e4
+Create Date: 2026-10-18 11:03:54.207115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c034d8a8008'
+down_revision: Union[str, Sequence[str], None] = 'c79f94d437e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_todos_owner_id_complete_priority', 'todos', ['owner_id', 'complete', 'priority'])
+    op.drop_index('ix_todos_title', table_name='todos')
+    op.drop_index('ix_todos_description', table_name='todos')
+    op.drop_index('ix_todos_id', table_name='todos')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_todos_id', 'todos', ['id'])
+    op.create_index('ix_todos_description', 'todos', ['description'])
+    op.create_index('ix_todos_title', 'todos', ['title'])
+    op.drop_index('ix_todos_owner_id_complete_priority', table_name='todos')
@@ -0,0 +1,30 @@
+"""add todo pagination indexes
+
+Revision ID: c79f94d437e4
+Revises: 7cb321c95531
+Create Date: 2026-10-18 10:12:31.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c79f94d437e4'
+down_revision: Union[str, Sequence[str], None] = '7cb321c95531'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_todos_owner_id_id', 'todos', ['owner_id', 'id'])
+    op.create_index('ix_todos_owner_id_priority_id', 'todos', ['owner_id', 'priority', 'id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_todos_owner_id_priority_id', table_name='todos')
+    op.drop_index('ix_todos_owner_id_id', table_name='todos')
@@ -0,0 +1,138 @@
+"""Old vs new Todo index set on a scratch SQLite file.
+
+Project folder se chalao:
+
+    python -m benchmarks.bench_indexes --rows 200000
+
+"old" = pehle wale indexes (id, title, description), "new" = jo todoapp/models.py
+mein abhi define hain. Dono ke liye insert/update time, file size aur router
+queries ka latency print hota hai.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from todoapp.models import Todo, Users
+
+
+OLD_INDEXES = [
+    "CREATE INDEX ix_todos_id ON todos (id)",
+    "CREATE INDEX ix_todos_title ON todos (title)",
+    "CREATE INDEX ix_todos_description ON todos (description)",
+]
+NEW_INDEXES = [str(CreateIndex(index).compile(dialect=sqlite.dialect())) for index in Todo.__table__.indexes]
+
+# Wohi queries jo routers chalate hain
+QUERIES = {
+    "list page (owner, id)": (
+        "SELECT * FROM todos WHERE owner_id = ? ORDER BY id LIMIT 101",
+        lambda owner, todo_id: (owner,),
+    ),
+    "get one (id, owner)": (
+        "SELECT * FROM todos WHERE id = ? AND owner_id = ?",
+        lambda owner, todo_id: (todo_id, owner),
+    ),
+    "filter complete+priority": (
+        "SELECT * FROM todos WHERE owner_id = ? AND complete = 0 AND priority = 3 ORDER BY id LIMIT 101",
+        lambda owner, todo_id: (owner,),
+    ),
+    "sort by priority": (
+        "SELECT * FROM todos WHERE owner_id = ? ORDER BY priority, id LIMIT 101",
+        lambda owner, todo_id: (owner,),
+    ),
+}
+
+
+def build(path, indexes, rows, users, seed):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(path)
+    conn.execute(str(CreateTable(Users.__table__).compile(dialect=sqlite.dialect())))
+    conn.execute(str(CreateTable(Todo.__table__).compile(dialect=sqlite.dialect())))
+    for ddl in indexes:
+        conn.execute(ddl)
+
+    started = time.perf_counter()
+    batch = []
+    for i in range(rows):
+        batch.append((
+            f"todo title {rng.random():.12f}",
+            f"some longer description text {rng.random():.12f}",
+            rng.random() < 0.5,
+            rng.randint(1, 5),
+            rng.randint(1, users),
+        ))
+        if len(batch) == 10000 or i == rows - 1:
+            conn.executemany(
+                "INSERT INTO todos (title, description, complete, priority, owner_id) VALUES (?, ?, ?, ?, ?)",
+                batch,
+            )
+            conn.commit()
+            batch = []
+    insert_seconds = time.perf_counter() - started
+    return conn, insert_seconds
+
+
+def time_updates(conn, rows, count, seed):
+    rng = random.Random(seed)
+    owners = dict(conn.execute("SELECT id, owner_id FROM todos"))
+    started = time.perf_counter()
+    for _ in range(count):
+        todo_id = rng.randint(1, rows)
+        conn.execute(
+            "UPDATE todos SET title = ?, description = ?, complete = ?, priority = ? WHERE id = ? AND owner_id = ?",
+            (f"new title {rng.random()}", f"new description {rng.random()}", rng.random() < 0.5,
+             rng.randint(1, 5), todo_id, owners[todo_id]),
+        )
+    conn.commit()
+    return time.perf_counter() - started
+
+
+def time_queries(conn, rows, users, count, seed):
+    results = {}
+    for name, (sql, make_params) in QUERIES.items():
+        rng = random.Random(seed)
+        params = [make_params(rng.randint(1, users), rng.randint(1, rows)) for _ in range(count)]
+        started = time.perf_counter()
+        for p in params:
+            conn.execute(sql, p).fetchall()
+        elapsed = time.perf_counter() - started
+        plan = " | ".join(row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params[0]))
+        results[name] = (elapsed / count * 1e6, plan)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--updates", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, indexes in (("old", OLD_INDEXES), ("new", NEW_INDEXES)):
+            path = os.path.join(tmp, f"{label}.db")
+            conn, insert_seconds = build(path, indexes, args.rows, args.users, args.seed)
+            update_seconds = time_updates(conn, args.rows, args.updates, args.seed)
+            query_results = time_queries(conn, args.rows, args.users, args.queries, args.seed)
+            conn.close()
+
+            print(f"== {label} indexes")
+            for ddl in indexes:
+                print(f"   {ddl}")
+            print(f"   insert   {args.rows / insert_seconds:>12,.0f} rows/s")
+            print(f"   update   {args.updates / update_seconds:>12,.0f} rows/s")
+            print(f"   db size  {os.path.getsize(path) / 1e6:>12.1f} MB")
+            for name, (micros, plan) in query_results.items():
+                print(f"   {name:<26} {micros:>8.1f} us   {plan}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Request path ke chhote hisson ka micro benchmark (HTTP aur database ke baghair).
+
+Project folder se chalao:
+
+    python -m benchmarks.bench_micro
+    python -m benchmarks.bench_micro --save micro.json
+    python -m benchmarks.bench_micro --baseline micro.json --max-regression 0.2
+
+Har case timeit se chalta hai (--repeat baar), best aur median time per call print hota hai.
+--baseline ke sath koi case --max-regression se zyada slow ho to exit code 1.
+"""
+import argparse
+import json
+import statistics
+import timeit
+from datetime import timedelta
+
+from jose import jwt
+
+from todoapp.etags import item_etag, list_etag
+from todoapp.models import Todo
+from todoapp.pagination import decode_cursor, encode_cursor
+from todoapp.passwords import bcrypt_context
+from todoapp.routers.auth import ALGORITHM, SECRET_KEY, create_access_token
+from todoapp.routers.todos import todo_list_adapter
+from todoapp.token_cache import TokenCache
+
+
+def make_cases(page_size):
+    token = create_access_token("bench1", 1, "user", timedelta(minutes=20))
+    claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    cache = TokenCache(1000)
+    cache.set(token, claims, claims["exp"])
+    hashed_password = bcrypt_context.hash("benchpass")
+    todos = [
+        Todo(id=i, title=f"todo {i}", description="micro benchmark", complete=i % 3 == 0,
+             priority=i % 5 + 1, owner_id=1, version=1)
+        for i in range(1, page_size + 1)
+    ]
+    cursor = encode_cursor(todos[-1], "priority")
+
+    return {
+        "bcrypt verify": lambda: bcrypt_context.verify("benchpass", hashed_password),
+        "jwt encode": lambda: create_access_token("bench1", 1, "user", timedelta(minutes=20)),
+        "jwt decode": lambda: jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]),
+        "token cache hit": lambda: cache.get(token),
+        "cursor encode": lambda: encode_cursor(todos[-1], "priority"),
+        "cursor decode": lambda: decode_cursor(cursor),
+        "list etag": lambda: list_etag(1, 42, "limit=100&sort=priority"),
+        "item etag": lambda: item_etag(7, 3),
+        f"serialize {page_size} todos": lambda: todo_list_adapter.dump_json(todos, by_alias=True),
+    }
+
+
+def measure(func, repeat):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    runs = [total / number for total in timer.repeat(repeat=repeat, number=number)]
+    return {"best_us": min(runs) * 1e6, "median_us": statistics.median(runs) * 1e6}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--only", help="sirf wo cases jin ke naam mein ye text ho")
+    parser.add_argument("--save")
+    parser.add_argument("--baseline")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'case':<24}{'best us':>14}{'median us':>14}")
+    for name, func in make_cases(args.page_size).items():
+        if args.only and args.only not in name:
+            continue
+        results[name] = measure(func, args.repeat)
+        print(f"{name:<24}{results[name]['best_us']:>14,.2f}{results[name]['median_us']:>14,.2f}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        failures = [
+            f"{name}: {baseline[name]['best_us']:.2f} -> {row['best_us']:.2f} us"
+            for name, row in results.items()
+            if name in baseline and row["best_us"] > baseline[name]["best_us"] * (1 + args.max_regression)
+        ]
+        for failure in failures:
+            print("REGRESSION", failure)
+        if failures:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""LIKE '%word%' vs FTS5 (todoapp/search.py) on a scratch SQLite file.
+
+Project folder se chalao:
+
+    python -m benchmarks.bench_search --rows 1000000
+
+Ek user ke todos mein ek word dhoondhne ka latency, dono tareeqon se. FTS wali query
+wahi hai jo GET /api/todos/search chalata hai. Vocabulary Zipf jaisi hai (kuch words bahut
+common, zyada tar rare) aur "miss" case aisa word dhoondta hai jo kahin nahi -- LIKE ka
+worst case, us user ki har row scan.
+
+--owners kam karo (e.g. 10) to har user ke paas zyada todos -> LIKE ka scan lamba hota hai.
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from todoapp.models import Todo, Users
+from todoapp.search import BM25_WEIGHTS, SEARCH_DDL, fts_query, search_statement
+
+
+VOCABULARY = 5000
+MISSING_WORD = "zzmissing"
+LIKE_QUERY = (
+    "SELECT * FROM todos WHERE owner_id = ? AND (title LIKE ? OR description LIKE ?) ORDER BY id LIMIT 20"
+)
+
+
+def vocabulary(size):
+    # Synthetic words (porter stemmer inhein nahi badalta), Zipf weights 1/rank
+    words = [f"w{n}x" for n in range(size)]
+    return words, [1 / (rank + 1) for rank in range(size)]
+
+
+def build(path, rows, owners, seed):
+    rng = random.Random(seed)
+    words, weights = vocabulary(VOCABULARY)
+    conn = sqlite3.connect(path)
+    conn.execute(str(CreateTable(Users.__table__).compile(dialect=sqlite.dialect())))
+    conn.execute(str(CreateTable(Todo.__table__).compile(dialect=sqlite.dialect())))
+    for index in Todo.__table__.indexes:
+        conn.execute(str(CreateIndex(index).compile(dialect=sqlite.dialect())))
+    for ddl in SEARCH_DDL["sqlite"]:
+        conn.execute(ddl)
+
+    started = time.perf_counter()
+    conn.executemany(
+        "INSERT INTO todos (title, description, complete, priority, owner_id, version) VALUES (?, ?, 0, 3, ?, 1)",
+        (
+            (" ".join(rng.choices(words, weights, k=3)), " ".join(rng.choices(words, weights, k=8)),
+             rng.randint(1, owners))
+            for _ in range(rows)
+        ),
+    )
+    conn.commit()
+    print(f"built {rows:,} rows (with FTS triggers) in {time.perf_counter() - started:.1f}s")
+    return conn
+
+
+def timed(conn, sql, params_for, samples, owners, seed, missing=False):
+    rng = random.Random(seed)
+    words, weights = vocabulary(VOCABULARY)
+    latencies = []
+    for _ in range(samples):
+        owner = rng.randint(1, owners)
+        word = MISSING_WORD if missing else rng.choices(words, weights)[0]
+        started = time.perf_counter()
+        conn.execute(sql, params_for(owner, word)).fetchall()
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return latencies[len(latencies) // 2] * 1e6, latencies[int(len(latencies) * 0.99) - 1] * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--owners", type=int, default=1000)
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    fts_sql = str(search_statement("sqlite", 0, "x", 20).compile(dialect=sqlite.dialect()))
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = build(os.path.join(tmp, "search.db"), args.rows, args.owners, args.seed)
+        cases = {
+            "LIKE '%word%'": (LIKE_QUERY, lambda owner, word: (owner, f"%{word}%", f"%{word}%")),
+            "FTS5 MATCH + bm25": (fts_sql, lambda owner, word: (fts_query(owner, word), *BM25_WEIGHTS, 20, 0)),
+        }
+        for missing in (False, True):
+            print("word not in any todo:" if missing else "word from the vocabulary:")
+            for label, (sql, params_for) in cases.items():
+                p50, p99 = timed(conn, sql, params_for, args.samples, args.owners, args.seed, missing)
+                print(f"   {label:<20} p50 {p50:>10,.1f} us   p99 {p99:>10,.1f} us")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
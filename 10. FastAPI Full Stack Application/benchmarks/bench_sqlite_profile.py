@@ -0,0 +1,142 @@
+"""SQLite defaults vs todoapp ka production profile (WAL + pragmas).
+
+Project folder se chalao:
+
+    python -m benchmarks.bench_sqlite_profile --writers 8 --readers 8
+
+todosapp.db ki copy temp folder mein banti hai (asal file ko haath nahi lagta),
+usme --seed-rows todos daale jate hain, phir:
+  * writes: --writers threads, har thread chhote commits karta hai (jaise create_todo)
+  * reads:  --readers threads list query chalate hain jab ek writer saath mein commit kar raha ho
+"""
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.schema import CreateIndex
+
+from todoapp.database import SQLITE_PRAGMAS, apply_sqlite_pragmas
+from todoapp.models import Todo
+
+
+SOURCE_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "todosapp.db")
+LIST_QUERY = "SELECT * FROM todos WHERE owner_id = ? ORDER BY id LIMIT 100"
+INSERT = "INSERT INTO todos (title, description, complete, priority, owner_id) VALUES (?, ?, ?, ?, ?)"
+
+
+def connect(path, tuned):
+    # timeout -> default profile ko bhi lock ka thora intezar karne do, warna sirf errors milte
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    if tuned:
+        apply_sqlite_pragmas(conn)
+    return conn
+
+
+def prepare(tmp, label, seed_rows, owners):
+    path = os.path.join(tmp, f"{label}.db")
+    shutil.copyfile(SOURCE_DB, path)
+    conn = sqlite3.connect(path)
+    # Copy purane schema pe ho sakti hai, models wale indexes laga do
+    for index in Todo.__table__.indexes:
+        conn.execute(str(CreateIndex(index, if_not_exists=True).compile(dialect=sqlite.dialect())))
+    rng = random.Random(1)
+    conn.executemany(INSERT, [
+        (f"title {i}", "seeded description", rng.random() < 0.5, rng.randint(1, 5), rng.randint(1, owners))
+        for i in range(seed_rows)
+    ])
+    conn.commit()
+    conn.close()
+    return path
+
+
+def run_threads(count, target):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def bench_writes(path, tuned, writers, commits, owners):
+    def writer(n):
+        conn = connect(path, tuned)
+        rng = random.Random(n)
+        for i in range(commits):
+            conn.execute(INSERT, (f"w{n}-{i}", "written by benchmark", False, rng.randint(1, 5), rng.randint(1, owners)))
+            conn.commit()
+        conn.close()
+
+    elapsed = run_threads(writers, writer)
+    return writers * commits / elapsed
+
+
+def bench_reads(path, tuned, readers, queries, owners):
+    stop = threading.Event()
+
+    def background_writer():
+        conn = connect(path, tuned)
+        # Steady write load (~200 commits/s) jaise live traffic mein hota hai
+        while not stop.wait(0.005):
+            conn.execute(INSERT, ("bg", "background write", False, 1, 1))
+            conn.commit()
+        conn.close()
+
+    latencies = []
+    lock = threading.Lock()
+
+    def reader(n):
+        conn = connect(path, tuned)
+        rng = random.Random(n)
+        mine = []
+        for _ in range(queries):
+            started = time.perf_counter()
+            conn.execute(LIST_QUERY, (rng.randint(1, owners),)).fetchall()
+            mine.append(time.perf_counter() - started)
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+
+    writer_thread = threading.Thread(target=background_writer)
+    writer_thread.start()
+    try:
+        elapsed = run_threads(readers, reader)
+    finally:
+        stop.set()
+        writer_thread.join()
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1e3
+    return readers * queries / elapsed, p99
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--commits", type=int, default=200)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--seed-rows", type=int, default=100000)
+    parser.add_argument("--owners", type=int, default=1000)
+    args = parser.parse_args()
+
+    print("profile pragmas:", ", ".join(f"{k}={v}" for k, v in SQLITE_PRAGMAS.items()))
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, tuned in (("default", False), ("profile", True)):
+            path = prepare(tmp, label, args.seed_rows, args.owners)
+            writes = bench_writes(path, tuned, args.writers, args.commits, args.owners)
+            reads, p99 = bench_reads(path, tuned, args.readers, args.queries, args.owners)
+            print(f"== {label}")
+            print(f"   writes  {writes:>10,.0f} commits/s  ({args.writers} writer threads)")
+            print(f"   reads   {reads:>10,.0f} queries/s  ({args.readers} readers + 1 writer), p99 {p99:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""HTTP load test: login / list / read / create / update / delete ka mix, fixed concurrency pe.
+
+Project folder se chalao:
+
+    python -m benchmarks.load --concurrency 20 --duration 30
+
+Default mein seeded SQLite file (benchmarks/seed.py) temp folder mein banti hai aur
+todoapp.main:app isi process mein httpx ke ASGI transport pe chalti hai (network ke baghair).
+Asli server ke against (saare virtual users ek hi IP se login karte hain, is liye login rate
+limiter band -- warna zyada tar logins 429 aur numbers bekaar):
+
+    python -m benchmarks.seed /tmp/bench.db --users 50
+    DATABASE_URL=sqlite:////tmp/bench.db LOGIN_RATE_LIMIT_BACKEND=off uvicorn todoapp.main:app --workers 4
+    python -m benchmarks.load --url http://127.0.0.1:8000 --users 50
+
+Har route ke liye requests/s aur p50/p95/p99 print hote hain. --save results.json se
+baseline rakh lo; deploy se pehle --baseline results.json ke sath chalao: kisi route ka
+p95 ya RPS --max-regression se zyada kharab ho to exit code 1.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.seed import PASSWORD, seed_database, username
+
+
+# Route template -> report mein isi naam se
+ROUTES = {
+    "login": "POST /auth/token",
+    "list": "GET /api/todos/",
+    "read": "GET /api/todos/todo/{id}",
+    "create": "POST /api/todos/todo",
+    "update": "PUT /api/todos/todo/{id}",
+    "delete": "DELETE /api/todos/todo/{id}",
+}
+# Default traffic mix (weights), --mix list=60,create=20,... se badlo
+DEFAULT_MIX = {"list": 50, "read": 15, "create": 15, "update": 10, "delete": 5, "login": 5}
+NEEDS_TODO = {"read", "update", "delete"}
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(q * len(sorted_values)) - 1)]
+
+
+class RouteStats:
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+
+    def record(self, seconds, status_code):
+        self.latencies.append(seconds)
+        # 304 (ETag hit) bhi kamiyab response hai
+        if status_code == 0 or status_code >= 400:
+            self.errors += 1
+
+    def summary(self, elapsed) -> dict:
+        latencies = sorted(self.latencies)
+        return {
+            "count": len(latencies),
+            "errors": self.errors,
+            "rps": len(latencies) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 0.50) * 1e3,
+            "p95_ms": percentile(latencies, 0.95) * 1e3,
+            "p99_ms": percentile(latencies, 0.99) * 1e3,
+        }
+
+
+class VirtualUser:
+    # Ek seeded user ki tarah behave karta hai: login, apne todos ki ids yaad rakhta hai
+    def __init__(self, client, n, seed):
+        self.client = client
+        self.n = n
+        self.rng = random.Random(seed)
+        self.headers = {}
+        self.todo_ids = []
+
+    async def login(self):
+        response = await self.client.post(
+            "/auth/token", data={"username": username(self.n), "password": PASSWORD}
+        )
+        if response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return response
+
+    async def list(self):
+        response = await self.client.get("/api/todos/", headers=self.headers)
+        if response.status_code == 200:
+            self.todo_ids = [todo["id"] for todo in response.json()]
+        return response
+
+    async def read(self):
+        todo_id = self.rng.choice(self.todo_ids)
+        return await self.client.get(f"/api/todos/todo/{todo_id}", headers=self.headers)
+
+    async def create(self):
+        response = await self.client.post("/api/todos/todo", headers=self.headers, json={
+            "title": "load test todo",
+            "description": "created by benchmarks.load",
+            "completed": False,
+            "priority": self.rng.randint(1, 5),
+        })
+        if response.status_code == 201:
+            self.todo_ids.append(response.json()["id"])
+        return response
+
+    async def update(self):
+        todo_id = self.rng.choice(self.todo_ids)
+        return await self.client.put(f"/api/todos/todo/{todo_id}", headers=self.headers, json={
+            "title": "updated todo",
+            "description": "updated by benchmarks.load",
+            "completed": self.rng.random() < 0.5,
+            "priority": self.rng.randint(1, 5),
+        })
+
+    async def delete(self):
+        todo_id = self.todo_ids.pop(self.rng.randrange(len(self.todo_ids)))
+        return await self.client.delete(f"/api/todos/todo/{todo_id}", headers=self.headers)
+
+
+async def drive(vu, mix, measure_from, deadline, stats):
+    actions, weights = list(mix), list(mix.values())
+    await vu.login()
+    await vu.list()
+    while time.perf_counter() < deadline:
+        action = vu.rng.choices(actions, weights)[0]
+        if action in NEEDS_TODO and not vu.todo_ids:
+            action = "list"
+        started = time.perf_counter()
+        try:
+            status_code = (await getattr(vu, action)()).status_code
+        except httpx.HTTPError:
+            status_code = 0
+        if started >= measure_from:
+            stats[action].record(time.perf_counter() - started, status_code)
+
+
+async def run_load(client, concurrency, users, mix, warmup, duration, seed):
+    stats = {action: RouteStats() for action in mix}
+    measure_from = time.perf_counter() + warmup
+    deadline = measure_from + duration
+    # Har virtual user ka apna seeded user, taake ek dusre ke todos delete na karein
+    await asyncio.gather(*[
+        drive(VirtualUser(client, i % users + 1, seed + i), mix, measure_from, deadline, stats)
+        for i in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - measure_from
+
+    routes = {ROUTES[action]: route_stats.summary(elapsed) for action, route_stats in stats.items()}
+    total = RouteStats()
+    for route_stats in stats.values():
+        total.latencies.extend(route_stats.latencies)
+        total.errors += route_stats.errors
+    return {"routes": routes, "total": total.summary(elapsed)}
+
+
+async def run_in_process(db_path, args, mix):
+    # DATABASE_URL todoapp import hone se PEHLE set hona chahiye (settings import pe parhi jati hain).
+    # Saare virtual users ek hi client IP: login limiter (30/min per IP) chalu ho to logins 429
+    # errors ban jate hain aur RPS/p95 baseline se milane layak nahi rehte
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["LOGIN_RATE_LIMIT_BACKEND"] = "off"
+    seed_database(db_path, args.users, args.todos_per_user)
+    from todoapp.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            return await run_load(client, args.concurrency, args.users, mix, args.warmup, args.duration, args.seed)
+
+
+async def run_against_url(args, mix):
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60) as client:
+        return await run_load(client, args.concurrency, args.users, mix, args.warmup, args.duration, args.seed)
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(","):
+        action, weight = part.split("=")
+        if action not in ROUTES:
+            raise argparse.ArgumentTypeError(f"unknown action {action!r}, choose from {', '.join(ROUTES)}")
+        mix[action] = int(weight)
+    return mix
+
+
+def compare(results, baseline, max_regression):
+    failures = []
+    for route, before in baseline["routes"].items():
+        after = results["routes"].get(route)
+        if after is None or not before["count"]:
+            continue
+        if after["p95_ms"] > before["p95_ms"] * (1 + max_regression):
+            failures.append(f"{route}: p95 {before['p95_ms']:.2f} -> {after['p95_ms']:.2f} ms")
+        if after["rps"] < before["rps"] * (1 - max_regression):
+            failures.append(f"{route}: rps {before['rps']:.1f} -> {after['rps']:.1f}")
+    return failures
+
+
+def print_report(results):
+    print(f"{'route':<28}{'count':>8}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = list(results["routes"].items()) + [("total", results["total"])]
+    for route, row in rows:
+        print(f"{route:<28}{row['count']:>8}{row['errors']:>8}{row['rps']:>10.1f}"
+              f"{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['p99_ms']:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="chalte hue server ka base URL; na do to app in-process chalti hai")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=20, help="seconds (warmup ke baad)")
+    parser.add_argument("--warmup", type=float, default=3)
+    parser.add_argument("--users", type=int, default=50, help="seeded users (--url ke sath: server pe kitne hain)")
+    parser.add_argument("--todos-per-user", type=int, default=200)
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--save", help="results is JSON file mein likho")
+    parser.add_argument("--baseline", help="purani --save file se compare karo")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args()
+    if args.concurrency > args.users:
+        parser.error("--concurrency --users se zyada nahi ho sakti (har virtual user ka alag seeded user)")
+
+    if args.url:
+        results = asyncio.run(run_against_url(args, args.mix))
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            results = asyncio.run(run_in_process(os.path.join(tmp, "bench.db"), args, args.mix))
+
+    results["config"] = {
+        "url": args.url, "concurrency": args.concurrency, "duration": args.duration, "mix": args.mix,
+    }
+    print_report(results)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            failures = compare(results, json.load(f), args.max_regression)
+        for failure in failures:
+            print("REGRESSION", failure)
+        if failures:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
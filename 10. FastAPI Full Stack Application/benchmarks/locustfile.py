@@ -0,0 +1,83 @@
+"""Locust scenario, benchmarks/load.py wala hi traffic mix (pip install locust).
+
+    python -m benchmarks.seed /tmp/bench.db --users 50
+    DATABASE_URL=sqlite:////tmp/bench.db LOGIN_RATE_LIMIT_BACKEND=off uvicorn todoapp.main:app --workers 4
+    locust -f benchmarks/locustfile.py --host http://127.0.0.1:8000 \\
+        --headless -u 50 -r 10 -t 1m --csv results
+
+LOGIN_RATE_LIMIT_BACKEND=off: locust ke saare users ek hi IP se login karte hain, limiter
+chalu ho to zyada tar logins 429 hote hain.
+Locust har route ki RPS aur percentiles khud report karta hai (results_stats.csv).
+Stats mein requests route template ke naam se group hoti hain (name=...).
+"""
+import itertools
+import random
+
+from locust import HttpUser, between, task
+
+from benchmarks.load import DEFAULT_MIX, ROUTES
+from benchmarks.seed import PASSWORD, username
+
+
+# Har naya locust user agla seeded user leta hai (bench1, bench2, ...)
+_user_numbers = itertools.count(1)
+
+
+class TodoUser(HttpUser):
+    wait_time = between(0, 0.05)
+    users = 50  # seeded users; -u isse zyada ho to users dobara use hote hain
+
+    def on_start(self):
+        self.n = (next(_user_numbers) - 1) % self.users + 1
+        self.todo_ids = []
+        self.login()
+        self.list()
+
+    @task(DEFAULT_MIX["login"])
+    def login(self):
+        response = self.client.post(
+            "/auth/token", data={"username": username(self.n), "password": PASSWORD}, name=ROUTES["login"]
+        )
+        if response.status_code == 200:
+            self.client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+    @task(DEFAULT_MIX["list"])
+    def list(self):
+        response = self.client.get("/api/todos/", name=ROUTES["list"])
+        if response.status_code == 200:
+            self.todo_ids = [todo["id"] for todo in response.json()]
+
+    @task(DEFAULT_MIX["read"])
+    def read(self):
+        if not self.todo_ids:
+            return self.list()
+        self.client.get(f"/api/todos/todo/{random.choice(self.todo_ids)}", name=ROUTES["read"])
+
+    @task(DEFAULT_MIX["create"])
+    def create(self):
+        response = self.client.post("/api/todos/todo", name=ROUTES["create"], json={
+            "title": "load test todo",
+            "description": "created by locust",
+            "completed": False,
+            "priority": random.randint(1, 5),
+        })
+        if response.status_code == 201:
+            self.todo_ids.append(response.json()["id"])
+
+    @task(DEFAULT_MIX["update"])
+    def update(self):
+        if not self.todo_ids:
+            return self.list()
+        self.client.put(f"/api/todos/todo/{random.choice(self.todo_ids)}", name=ROUTES["update"], json={
+            "title": "updated todo",
+            "description": "updated by locust",
+            "completed": random.random() < 0.5,
+            "priority": random.randint(1, 5),
+        })
+
+    @task(DEFAULT_MIX["delete"])
+    def delete(self):
+        if not self.todo_ids:
+            return self.list()
+        todo_id = self.todo_ids.pop(random.randrange(len(self.todo_ids)))
+        self.client.delete(f"/api/todos/todo/{todo_id}", name=ROUTES["delete"])
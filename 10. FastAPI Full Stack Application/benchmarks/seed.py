@@ -0,0 +1,72 @@
+"""Load test ke liye seeded SQLite file.
+
+    python -m benchmarks.seed /tmp/bench.db --users 50 --todos-per-user 200
+
+Har user ka username bench{n} aur password PASSWORD hai. Password ka bcrypt hash
+sirf ek baar banta hai aur saare users mein same rakha jata hai (seeding fast rahe).
+"""
+import argparse
+import os
+import random
+import sqlite3
+
+from sqlalchemy import create_engine
+
+
+PASSWORD = "benchpass"
+
+
+def username(n: int) -> str:
+    return f"bench{n}"
+
+
+def seed_database(path, users=50, todos_per_user=200, seed=1):
+    # Schema models se (indexes samet) + alembic head stamp, jaise app khali DB pe startup mein karti hai
+    from todoapp.database import Base
+    from todoapp.passwords import bcrypt_context
+    from todoapp.startup import stamp_head
+
+    if os.path.exists(path):
+        os.remove(path)
+    schema_engine = create_engine(f"sqlite:///{path}")
+    with schema_engine.begin() as connection:
+        Base.metadata.create_all(connection)
+        stamp_head(connection)
+    schema_engine.dispose()
+
+    rng = random.Random(seed)
+    hashed_password = bcrypt_context.hash(PASSWORD)
+    conn = sqlite3.connect(path)
+    conn.executemany(
+        "INSERT INTO users (id, email, username, first_name, last_name, hashed_password, is_active, role, phone_number, todos_version)"
+        " VALUES (?, ?, ?, 'bench', 'user', ?, 1, ?, '0000000', 0)",
+        [
+            (n, f"{username(n)}@example.com", username(n), hashed_password, "admin" if n == 1 else "user")
+            for n in range(1, users + 1)
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO todos (title, description, complete, priority, owner_id, version) VALUES (?, ?, ?, ?, ?, 1)",
+        [
+            (f"todo {i}", "seeded by benchmarks", rng.random() < 0.3, rng.randint(1, 5), n)
+            for n in range(1, users + 1)
+            for i in range(todos_per_user)
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--todos-per-user", type=int, default=200)
+    args = parser.parse_args()
+    seed_database(args.path, args.users, args.todos_per_user)
+    print(f"seeded {args.path}: {args.users} users x {args.todos_per_user} todos, password {PASSWORD!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,362 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import asyncio
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from typing import Annotated
+from fastapi import Depends, Request
+from sqlalchemy import event, exc, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
+from todoapp.config import settings
 
-# Mysql  database URL
-SQLALCHEMY_DATABASE_URL = "sqlite:///./todosapp.db"
+# Database URL ab settings (DATABASE_URL env) se aata hai
+SQLALCHEMY_DATABASE_URL = settings.database_url
 
+# Sync driver -> async driver for the same database
+# sqlite -> aiosqlite, postgresql (06 project) -> asyncpg, mysql (07 project) -> aiomysql
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+}
 
 
-# Create engine
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+def to_async_url(url: str) -> str:
+    scheme, rest = url.split("://", 1)
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
+SQLALCHEMY_ASYNC_DATABASE_URL = to_async_url(SQLALCHEMY_DATABASE_URL)
+
+
+# SQLite production profile -> har nayi connection pe ye PRAGMAs lagte hain
+# WAL         -> readers writer ka intezar nahi karte, commit sirf WAL file mein append
+# NORMAL      -> WAL ke sath safe, har commit pe fsync nahi
+# mmap_size   -> database file memory-map ho ke read hoti hai
+# cache_size  -> negative value = KiB (yahan 64 MB page cache per connection)
+# busy_timeout-> lock mile na to foran "database is locked" ki jagah itne ms wait
+# temp_store  -> temp tables / sorting memory mein
+# SQLITE_PROFILE=0 karo to sab SQLite defaults pe wapas
+SQLITE_PRAGMAS = {
+    "journal_mode": settings.sqlite_journal_mode,
+    "synchronous": settings.sqlite_synchronous,
+    "mmap_size": settings.sqlite_mmap_size,
+    "cache_size": settings.sqlite_cache_size,
+    "busy_timeout": settings.sqlite_busy_timeout_ms,
+    "temp_store": settings.sqlite_temp_store,
+}
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record=None):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+# ---------------- Pool metrics ----------------
+# Har engine ka apna PoolMetrics: kitni baar connection mili, kitna intezar karna para,
+# kitni der request ne connection pakar ke rakhi, kitne timeouts aaye.
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.hold_seconds = 0.0
+
+    def stats(self, pool) -> dict:
+        stats = {
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "wait_seconds": self.wait_seconds,
+            "max_wait_seconds": self.max_wait_seconds,
+            "hold_seconds": self.hold_seconds,
+        }
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            stats.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow())
+        return stats
+
+
+class MeteredAsyncPool(AsyncAdaptedQueuePool):
+    metrics = None
+
+    # _do_get wahi jagah hai jahan free connection ka intezar hota hai
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.timeouts += 1
+            raise
+        finally:
+            if self.metrics is not None:
+                waited = time.perf_counter() - started
+                self.metrics.wait_seconds += waited
+                self.metrics.max_wait_seconds = max(self.metrics.max_wait_seconds, waited)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+# engine name -> (async engine, PoolMetrics)
+ENGINES = {}
+
 
-# Session local for DB connection
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _watch_pool(sync_engine, metrics: PoolMetrics):
+    @event.listens_for(sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.checkins += 1
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            metrics.hold_seconds += time.perf_counter() - checked_out_at
+
+    @event.listens_for(sync_engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+
+def statement_timeout_args(url: str) -> dict:
+    ms = settings.db_statement_timeout_ms
+    if not ms:
+        return {}
+    if url.startswith("postgresql+asyncpg"):
+        return {"server_settings": {"statement_timeout": str(ms)}}
+    if url.startswith("postgresql"):
+        return {"options": f"-c statement_timeout={ms}"}
+    if url.startswith("mysql"):
+        return {"init_command": f"SET SESSION max_execution_time={ms}"}
+    return {}
+
+
+def make_async_engine(url: str, name: str = "primary"):
+    options = {
+        "echo": settings.db_echo,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "connect_args": statement_timeout_args(url),
+    }
+    # In-memory SQLite ek hi connection pe chalti hai, uske liye pool sizing nahi
+    if ":memory:" not in url:
+        options.update(
+            poolclass=MeteredAsyncPool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+        )
+    new_engine = create_async_engine(url, **options)
+
+    metrics = PoolMetrics(name)
+    if isinstance(new_engine.pool, MeteredAsyncPool):
+        new_engine.pool.metrics = metrics
+    _watch_pool(new_engine.sync_engine, metrics)
+    if url.startswith("sqlite") and settings.sqlite_profile:
+        event.listen(new_engine.sync_engine, "connect", apply_sqlite_pragmas)
+
+    ENGINES[name] = (new_engine, metrics)
+    return new_engine
+
+
+def pool_stats() -> dict:
+    return {name: metrics.stats(pool_engine.pool) for name, (pool_engine, metrics) in ENGINES.items()}
+
+
+# Async engine -> routers isko use karte hain taake query event loop ko block na kare
+async_engine = make_async_engine(SQLALCHEMY_ASYNC_DATABASE_URL)
+
+# expire_on_commit=False -> commit ke baad object ke attributes dobara load (lazy IO) nahi hote
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 
 # Base class for models
 Base = declarative_base()
+
+
+# ---------------- Read replicas ----------------
+# GET endpoints get_read_db use karte hain: session round-robin se kisi healthy replica pe.
+# Writes hamesha primary (get_db) pe, aur jis client ne abhi write kiya ho uski reads
+# read_your_writes_seconds tak primary se, taake replication lag ki wajah se purana data na dikhe.
+#
+# "Kis ne abhi write kiya" ka record (READ_YOUR_WRITES_BACKEND):
+#   memory    -> in-process (default); sirf ek worker mein sahi. `--workers N` mein client ki write
+#                worker A pe aur read worker B pe ho to B ko pata nahi -> read lagging replica se.
+#   redis     -> Redis server (REDIS_URL), saare workers ek record share karte hain
+#   fakeredis -> Redis backend, local in-memory FakeRedis ke sath (tests / local)
+class Replica:
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.engine = make_async_engine(to_async_url(url), name)
+        self.sessionmaker = async_sessionmaker(
+            self.engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+        self.healthy = True
+        self.checked_at = 0.0
+
+    async def ping(self):
+        # checked_at pehle set, taake ek waqt mein bohat si requests same replica ko ping na karein
+        self.checked_at = time.monotonic()
+
+        async def select_one():
+            async with self.engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+
+        try:
+            await asyncio.wait_for(select_one(), settings.replica_ping_timeout)
+            self.healthy = True
+        except Exception:
+            self.healthy = False
+
+
+class MemoryWriters:
+    # Itne clients se zyada "recent writers" yaad nahi rakhte
+    MAX_RECENT_WRITERS = 100000
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self._recent_writers = OrderedDict()  # client key -> last write time
+
+    async def record(self, key: str):
+        self._recent_writers[key] = time.monotonic()
+        self._recent_writers.move_to_end(key)
+        while len(self._recent_writers) > self.MAX_RECENT_WRITERS:
+            self._recent_writers.popitem(last=False)
+
+    async def recent(self, key: str) -> bool:
+        written_at = self._recent_writers.get(key)
+        return written_at is not None and time.monotonic() - written_at < self.seconds
+
+
+class RedisWriters:
+    # Key: ryw:{client key} -> write ke baad read_your_writes_seconds mein expire
+    def __init__(self, client, seconds: float):
+        self.client = client
+        self.seconds = seconds
+
+    async def record(self, key: str):
+        await self.client.incr(f"ryw:{key}")
+        await self.client.expire(f"ryw:{key}", math.ceil(self.seconds))
+
+    async def recent(self, key: str) -> bool:
+        return await self.client.get(f"ryw:{key}") is not None
+
+
+def make_writers():
+    kind = settings.read_your_writes_backend
+    if kind == "redis":
+        import redis.asyncio
+        return RedisWriters(redis.asyncio.from_url(settings.redis_url), settings.read_your_writes_seconds)
+    if kind == "fakeredis":
+        from todoapp.todo_cache import FakeRedis
+        return RedisWriters(FakeRedis(), settings.read_your_writes_seconds)
+    return MemoryWriters(settings.read_your_writes_seconds)
+
+
+class ReplicaRouter:
+    def __init__(self, urls, writers):
+        self.replicas = [Replica(f"replica{i}", url) for i, url in enumerate(urls, 1)]
+        self._next = 0
+        self.writers = writers
+
+    async def pick(self):
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._next % len(self.replicas)]
+            self._next += 1
+            if time.monotonic() - replica.checked_at > settings.replica_health_interval:
+                await replica.ping()
+            if replica.healthy:
+                return replica
+        return None
+
+    async def record_write(self, key):
+        if key is not None:
+            await self.writers.record(key)
+
+    async def wrote_recently(self, key) -> bool:
+        return key is not None and await self.writers.recent(key)
+
+    def stats(self) -> dict:
+        return {replica.name: {"healthy": replica.healthy} for replica in self.replicas}
+
+
+replica_router = ReplicaRouter(
+    [url.strip() for url in settings.database_replica_urls.split(",") if url.strip()],
+    make_writers(),
+)
+
+
+def client_key(request: Request):
+    # Client ko uske token se pehchante hain (auth module import kiye baghair). hash() nahi:
+    # wo har process mein alag hota hai, shared backend mein workers ki keys match na hotin.
+    authorization = request.headers.get("authorization")
+    return hashlib.sha256(authorization.encode()).hexdigest() if authorization else None
+
+
+@event.listens_for(Session, "after_commit")
+def remember_writer(session):
+    # Sync event hai (backend await nahi ho sakta): sirf nishan, record get_db karta hai
+    session.info["committed"] = True
+
+
+async def get_db(request: Request):
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        finally:
+            # Endpoint ke baad, response se pehle: client ki agli read isi record ko dekhegi
+            if replica_router.replicas and db.info.get("committed"):
+                await replica_router.record_write(client_key(request))
+
+
+async def get_read_db(request: Request):
+    replica = None
+    if replica_router.replicas and not await replica_router.wrote_recently(client_key(request)):
+        replica = await replica_router.pick()
+    if replica is None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    async with replica.sessionmaker() as db:
+        try:
+            yield db
+        except (exc.OperationalError, exc.InterfaceError):
+            # Replica beech mein gir gayi, agle pick tak isse skip karo
+            replica.healthy = False
+            replica.checked_at = time.monotonic()
+            raise
+
+
+# Saare routers yahi do dependencies use karte hain.
+# * Session lazy hai: connection pool se tabhi nikalti hai jab pehli query chale
+#   (cache hit / 304 wali request connection ko haath hi nahi lagati), aur commit pe wapas.
+# * Ek request mein jitni bhi dependencies db_dependency maangein, FastAPI sab ko wahi ek session deta hai.
+# * scope="function" -> session endpoint return hote hi band, response serialize / stream hone se
+#   PEHLE. Default scope mein session (aur read query ki connection) response bhej dene tak pakri rehti.
+db_dependency = Annotated[AsyncSession, Depends(get_db, scope="function")]
+# GET endpoints -> read replica (agar configured ho)
+read_db_dependency = Annotated[AsyncSession, Depends(get_read_db, scope="function")]
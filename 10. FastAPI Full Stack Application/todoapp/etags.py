@@ -0,0 +1,57 @@
+import hashlib
+from fastapi import Request, Response
+from sqlalchemy import update
+from starlette import status
+from todoapp.models import Users
+
+
+# Conditional GET: har user ka ek todos_version counter hai (users table mein) jo uske
+# kisi bhi todo ke create/update/delete pe +1 hota hai, aur har todo ka apna version.
+# Client pichla ETag If-None-Match mein bhejta hai; version same ho to 304, body dobara nahi banti.
+CACHE_CONTROL = "private, no-cache"
+
+
+async def bump_todos_version(db, owner_id: int):
+    # Usi transaction mein jis mein todo badla, taake version aur data hamesha saath commit hon
+    await db.execute(
+        update(Users).where(Users.id == owner_id).values(todos_version=Users.todos_version + 1)
+    )
+
+
+def list_etag(owner_id: int, version: int, query: str) -> str:
+    # Alag filters/pages ka content alag hai, is liye query string bhi ETag ka hissa hai
+    query_digest = hashlib.sha1(query.encode()).hexdigest()[:12]
+    return f'"todos-{owner_id}-{version}-{query_digest}"'
+
+
+def item_etag(todo_id: int, version: int) -> str:
+    return f'"todo-{todo_id}-{version}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def json_response(body: bytes, etag: str, headers: dict = None) -> Response:
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={**(headers or {}), "ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
+    )
@@ -0,0 +1,52 @@
+import csv
+import io
+import json
+from sqlalchemy import select
+from todoapp.models import Todo
+from todoapp.database import AsyncSessionLocal
+
+
+# Export poori table ko memory mein load nahi karta: rows database cursor se
+# EXPORT_BATCH_SIZE ke chunks mein aati hain aur turant client ko bhej di jati hain.
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = ("id", "title", "description", "complete", "priority", "owner_id")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _ndjson_chunk(rows) -> str:
+    return "".join(json.dumps(dict(zip(EXPORT_COLUMNS, row))) + "\n" for row in rows)
+
+
+def _csv_chunk(rows, header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+async def stream_todos(fmt: str, where=()):
+    # ORM objects ki jagah sirf columns (tuples) select karte hain, allocation kam hoti hai
+    stmt = (
+        select(*(getattr(Todo, name) for name in EXPORT_COLUMNS))
+        .where(*where)
+        .order_by(Todo.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    # Response streaming request ke dependencies khatam hone ke baad bhi chalti hai,
+    # is liye generator apna session khud kholta aur band karta hai
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt)
+        if fmt == "csv":
+            yield _csv_chunk((), header=True)
+        async for rows in result.partitions():
+            if fmt == "csv":
+                yield _csv_chunk(rows)
+            else:
+                yield _ndjson_chunk(rows)
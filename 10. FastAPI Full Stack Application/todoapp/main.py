@@ -1,18 +1,28 @@
-from fastapi import FastAPI,Request
-from . import models
-from .database import engine
+from fastapi import FastAPI,Request,Response
+from .database import pool_stats, ENGINES
+from .config import settings
+from .metrics import registry, StatsCollector, MetricsMiddleware, CONTENT_TYPE
+from . import query_profiler
+from .startup import lifespan
+from .passwords import password_pool
+from .token_cache import token_cache
+from .todo_cache import todo_cache
+from .rate_limit import login_rate_limiter
 from .routers import todos, auth,admin,users
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 
 # Configure templates
 templates = Jinja2Templates(directory="todoapp/templates")
 
-
-models.Base.metadata.create_all(bind=engine)
-
-app = FastAPI()
+# Schema check, pool warm-up aur statement precompile worker start pe hote hain (dekho todoapp/startup.py),
+# import pe create_all ab nahi chalta
+app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if settings.orjson_responses else JSONResponse
+)
 
 app.mount("/static", StaticFiles(directory="todoapp/static"), name="static")
 
@@ -21,6 +31,34 @@ app.include_router(auth.router)
 app.include_router(admin.router)
 app.include_router(users.router)
 
+if settings.metrics_enabled:
+    registry.register(StatsCollector(
+        "db_pool", pool_stats, "Database connection pool", label="engine",
+        counters=("checkouts", "checkins", "connects", "invalidations", "timeouts", "wait_seconds", "hold_seconds"),
+    ))
+    registry.register(StatsCollector(
+        "password_pool", password_pool.stats, "bcrypt worker pool",
+        counters=("completed", "rejected", "wait_seconds"),
+    ))
+    registry.register(StatsCollector("jwt_cache", token_cache.stats, "Decoded JWT cache", counters=("hits", "misses")))
+    registry.register(StatsCollector(
+        "todo_cache", todo_cache.stats, "GET /api/todos/ cache", counters=("hits", "misses", "invalidations"),
+    ))
+    registry.register(StatsCollector(
+        "login_rate_limit", login_rate_limiter.stats, "POST /auth/token rate limiter", label="limiter",
+        counters=("allowed", "rejected"),
+    ))
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        # async -> event loop pe hi render, counters kisi aur thread se nahi parhe jate
+        return Response(registry.render(), media_type=CONTENT_TYPE)
+
+if settings.sql_profiling:
+    query_profiler.install(async_engine for async_engine, _ in ENGINES.values())
+    app.add_middleware(query_profiler.QueryProfilerMiddleware)
+
 @app.get("/")
 def test_page(request: Request):
     return templates.TemplateResponse("home.html", {"request": request})
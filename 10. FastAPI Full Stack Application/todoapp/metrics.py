@@ -0,0 +1,243 @@
+import time
+from bisect import bisect_left
+
+
+# Prometheus text format (0.0.4) /metrics ke liye, bina prometheus_client dependency ke.
+#
+# Har metric ke "children" (ek label set = ek child) ek hi baar bante hain aur cache hote hain;
+# request ke dauran sirf pehle se bane child pe inc()/observe() hota hai, label dict nahi banti.
+# Metrics har worker process ki apni hoti hain: multi-worker deploy mein har worker alag scrape karo.
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra="") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    if isinstance(value, bool):
+        return str(int(value))
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # aakhri slot = +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def time(self):
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("child", "started")
+
+    def __init__(self, child):
+        self.child = child
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.child.observe(time.perf_counter() - self.started)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = self._new_child()
+        return child
+
+    def collect(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self._samples()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def _samples(self):
+        for values, child in list(self._children.items()):
+            yield f"{self.name}{_labels(self.labelnames, values)} {_number(child.value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.bounds = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.bounds)
+
+    def _samples(self):
+        les = [_number(bound) for bound in self.bounds] + ["+Inf"]
+        for values, child in list(self._children.items()):
+            cumulative = 0
+            for le, count in zip(les, child.counts):
+                cumulative += count
+                bucket_labels = _labels(self.labelnames, values, f'le="{le}"')
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            yield f"{self.name}_count{_labels(self.labelnames, values)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, values)} {_number(child.sum)}"
+
+
+class StatsCollector:
+    # Kisi bhi stats() dict ko metrics mein badal deta hai (PoolMetrics, PasswordPool, caches).
+    # label diya ho to stats() {label value: dict} return karta hai (jaise pool_stats()).
+    # counters wali keys counter (_total) banti hain, baqi numbers gauge; strings skip.
+    def __init__(self, prefix: str, stats, documentation: str, label: str = None, counters=()):
+        self.prefix = prefix
+        self.stats = stats
+        self.documentation = documentation
+        self.label = label
+        self.counters = frozenset(counters)
+
+    def collect(self):
+        stats = self.stats()
+        rows = stats.items() if self.label else [(None, stats)]
+        samples = {}
+        for label_value, row in rows:
+            labels = _labels((self.label,), (label_value,)) if self.label else ""
+            for key, value in row.items():
+                if isinstance(value, (int, float)):
+                    samples.setdefault(key, []).append(f"{labels} {_number(value)}")
+        for key, lines in samples.items():
+            is_counter = key in self.counters
+            name = f"{self.prefix}_{key}_total" if is_counter else f"{self.prefix}_{key}"
+            yield f"# HELP {name} {self.documentation} ({key})"
+            yield f"# TYPE {name} {'counter' if is_counter else 'gauge'}"
+            for line in lines:
+                yield name + line
+
+
+class Registry:
+    def __init__(self):
+        self._collectors = []
+
+    def register(self, collector):
+        self._collectors.append(collector)
+        return collector
+
+    def render(self) -> bytes:
+        lines = []
+        for collector in self._collectors:
+            lines.extend(collector.collect())
+        lines.append("")
+        return "\n".join(lines).encode()
+
+
+registry = Registry()
+
+REQUESTS = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status")
+))
+REQUEST_SECONDS = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template and status", ("method", "route", "status")
+))
+IN_FLIGHT = registry.register(Gauge("http_requests_in_flight", "HTTP requests being served")).labels()
+
+# bcrypt (passwords.py) aur JWT (routers/auth.py) ka CPU time; op label pe
+PASSWORD_SECONDS = registry.register(Histogram(
+    "password_hash_duration_seconds", "bcrypt hash/verify time in the worker pool (queue wait excluded)", ("op",)
+))
+JWT_SECONDS = registry.register(Histogram(
+    "jwt_duration_seconds", "JWT encode/decode time (token cache hits excluded)", ("op",),
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025),
+))
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    # Pure ASGI middleware (BaseHTTPMiddleware nahi: wo har request pe extra task banata hai
+    # aur streaming responses ko wrap karta hai). Route label = route ka template
+    # (/api/todos/todo/{todo_id}), asal path nahi, taake label sets gine chune rahein.
+    def __init__(self, app):
+        self.app = app
+        self._children = {}  # (route template, method, status) -> (counter child, histogram child)
+
+    def _resolve(self, key):
+        path, method, status_code = key
+        path = path or UNMATCHED_ROUTE
+        children = (REQUESTS.labels(method, path, status_code), REQUEST_SECONDS.labels(method, path, status_code))
+        self._children[key] = children
+        return children
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        IN_FLIGHT.value += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.value -= 1
+            # Router scope["route"] set karta hai (routing ke baad hi pata chalta hai)
+            key = (getattr(scope.get("route"), "path", None), scope["method"], status_code)
+            children = self._children.get(key) or self._resolve(key)
+            children[0].value += 1
+            children[1].observe(elapsed)
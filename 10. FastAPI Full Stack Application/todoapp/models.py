@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Index, func, literal_column
 from todoapp.database import Base
 
 
@@ -10,12 +10,26 @@ from todoapp.database import Base
 class Todo(Base):
     __tablename__ = "todos"
 
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, index=True)
-    description = Column(String, index=True)
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+    description = Column(String)
     complete = Column(Boolean, default=False)
     priority = Column(Integer)
     owner_id = Column(Integer, ForeignKey("users.id"))
+    # Har update pe +1, GET /todo/{id} ka ETag isi se banta hai
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+    # Indexes routers ki asal queries ke hisaab se (title/description pe koi filter nahi karta,
+    # aur id pe alag index primary key ke hote hue bekaar hai):
+    # (owner_id, id)                -> list by id, get/update/delete by id + owner
+    # (owner_id, coalesce(priority, 0), id) -> ?sort=priority pagination (pagination.py NULL ko 0
+    #                                          maan ke sort karta hai, index bhi usi expression pe)
+    # (owner_id, complete, priority) -> ?complete= / ?priority= filters
+    __table_args__ = (
+        Index("ix_todos_owner_id_id", "owner_id", "id"),
+        Index("ix_todos_owner_id_sort_priority_id", "owner_id", func.coalesce(priority, literal_column("0")), "id"),
+        Index("ix_todos_owner_id_complete_priority", "owner_id", "complete", "priority"),
+    )
 
 
 class Users(Base):
@@ -30,3 +44,5 @@ class Users(Base):
     is_active = Column(Boolean, default=True)
     role = Column(String)
     phone_number = Column(String, nullable=True)
+    # User ke kisi bhi todo ke create/update/delete pe +1, GET /api/todos/ ka ETag isi se banta hai
+    todos_version = Column(Integer, nullable=False, default=0, server_default="0")
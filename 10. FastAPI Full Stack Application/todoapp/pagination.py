@@ -0,0 +1,86 @@
+import base64
+import json
+from typing import Literal, Optional
+from fastapi import HTTPException
+from sqlalchemy import func, literal_column, tuple_
+from todoapp.models import Todo
+
+
+# Keyset (cursor) pagination: OFFSET ki jagah "last row ke baad wali rows" mangte hain,
+# is liye page 1 ho ya page 10000, query utni hi fast rehti hai.
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# sort option -> (column, descending)
+# har sort mein Todo.id tie-breaker hai taake order (aur cursor) hamesha unique rahe
+SORT_OPTIONS = {
+    "id": (Todo.id, False),
+    "-id": (Todo.id, True),
+    "priority": (Todo.priority, False),
+    "-priority": (Todo.priority, True),
+}
+SortOption = Literal["id", "-id", "priority", "-priority"]
+
+# Priority nullable hai: `(NULL, id) > (...)` khud NULL hota hai aur pagination pehli NULL row pe
+# chup chaap ruk jati. Is liye sort aur cursor dono coalesce(priority, 0) pe -- priority 1-5 hai,
+# to NULL wali rows "priority" mein sab se pehle aur "-priority" mein aakhir mein. Index bhi isi
+# expression pe hai (models.Todo, ix_todos_owner_id_sort_priority_id); 0 bind param nahi, literal,
+# warna planner query ko index ke expression se match nahi karta.
+NULL_SORT_VALUE = 0
+
+
+def _sort_key(column):
+    return column if column is Todo.id else func.coalesce(column, literal_column(str(NULL_SORT_VALUE)))
+
+
+def encode_cursor(todo, sort: str) -> str:
+    column, _ = SORT_OPTIONS[sort]
+    value = getattr(todo, column.key)
+    raw = json.dumps([NULL_SORT_VALUE if value is None else value, todo.id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        value, last_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Shape ke sath types bhi: [{"a":1}, 2] jaisa cursor warna bind param pe 500 deta hai
+    # (bool bhi int ka subclass hai, wo bhi nahi chahiye)
+    if not _is_int(last_id) or not (value is None or _is_int(value)):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return value, last_id
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def paginate(stmt, sort: str, cursor: Optional[str], limit: int):
+    column, descending = SORT_OPTIONS[sort]
+
+    if cursor is not None:
+        value, last_id = decode_cursor(cursor)
+        if column is Todo.id:
+            stmt = stmt.where(Todo.id < last_id if descending else Todo.id > last_id)
+        else:
+            if value is None:
+                value = NULL_SORT_VALUE  # coalesce se pehle bane cursors
+            key = tuple_(_sort_key(column), Todo.id)
+            stmt = stmt.where(key < (value, last_id) if descending else key > (value, last_id))
+
+    if column is Todo.id:
+        order = [Todo.id.desc() if descending else Todo.id]
+    else:
+        key = _sort_key(column)
+        order = [key.desc(), Todo.id.desc()] if descending else [key, Todo.id]
+
+    # Ek row extra mangte hain, sirf ye janne ke liye ke agla page hai ya nahi
+    return stmt.order_by(*order).limit(limit + 1)
+
+
+def split_page(rows: list, sort: str, limit: int):
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1], sort)
+    return rows, None
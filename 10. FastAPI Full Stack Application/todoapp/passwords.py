@@ -0,0 +1,116 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from starlette import status
+from todoapp.config import settings
+from todoapp.metrics import PASSWORD_SECONDS
+
+
+# CryptContext ek class hai jo password hashing/verification ke liye use hoti hai
+# schemes=["bcrypt"] -> passwords ko bcrypt algorithm se hash karega
+# deprecated="auto" -> agar koi purani hashing scheme ho to usse outdated mark karega
+bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# bcrypt ek hash pe ~100-300 ms CPU leta hai, event loop pe chalaye to baaki sab requests ruk jati hain.
+# Is liye hashing/verify ek alag worker pool mein hoti hai
+# (PASSWORD_POOL / PASSWORD_WORKERS / PASSWORD_MAX_PENDING, dekho config.py).
+
+
+# Module level functions taake process pool inko pickle kar sake
+def _hash(password: str) -> str:
+    return bcrypt_context.hash(password)
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return bcrypt_context.verify(password, hashed_password)
+
+
+# /metrics ke password_hash_duration_seconds{op=...} children, pehle se resolved
+_OP_SECONDS = {_hash: PASSWORD_SECONDS.labels("hash"), _verify: PASSWORD_SECONDS.labels("verify")}
+
+
+class PasswordPool:
+    def __init__(self, kind: str, workers: int, max_pending: int):
+        self.kind = kind
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._slots = asyncio.Semaphore(workers)
+
+        # metrics
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password"
+                )
+        return self._executor
+
+    async def run(self, fn, *args):
+        # Queue full -> turant 503, taake login burst poori API ko slow na kare
+        if self.queued >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many password requests, try again",
+                headers={"Retry-After": "1"},
+            )
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        self.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+        self.wait_seconds += loop.time() - started
+
+        self.in_flight += 1
+        started = loop.time()
+        try:
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            op_seconds = _OP_SECONDS.get(fn)
+            if op_seconds is not None:
+                op_seconds.observe(loop.time() - started)
+            self.in_flight -= 1
+            self.completed += 1
+            self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "pool": self.kind,
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "queued": self.queued,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_seconds": self.wait_seconds,
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_pool = PasswordPool(settings.password_pool, settings.password_workers, settings.password_max_pending)
+
+
+async def hash_password(password: str) -> str:
+    return await password_pool.run(_hash, password)
+
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    return await password_pool.run(_verify, password, hashed_password)
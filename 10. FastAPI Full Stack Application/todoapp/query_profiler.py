@@ -0,0 +1,107 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from todoapp.config import settings
+
+
+# Per-request SQL profiling (SQL_PROFILING=1 se on).
+#
+# before/after_cursor_execute events har statement ka time naapte hain aur use current
+# request ke RequestProfile mein jorte hain. Request contextvar se milti hai: async engine
+# statements greenlet mein chalata hai lekin contextvars wahi rehte hain jo request task ke.
+#   * Server-Timing header: db;dur=<ms>;desc="<n> queries", app;dur=<ms> (browser devtools mein dikhta hai)
+#   * slow query (SQL_SLOW_QUERY_MS se zyada) -> todoapp.sql logger pe warning, params redacted
+#   * ek request mein same statement SQL_REPEAT_THRESHOLD ya zyada baar -> N+1 warning
+logger = logging.getLogger("todoapp.sql")
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("sql_profile", default=None)
+
+
+class RequestProfile:
+    __slots__ = ("started", "queries", "db_seconds", "statements")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statements = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.queries += 1
+        self.db_seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int):
+        return [(statement, count) for statement, count in self.statements.items() if count >= threshold]
+
+    def server_timing(self) -> bytes:
+        app_ms = (time.perf_counter() - self.started) * 1e3
+        return f'db;dur={self.db_seconds * 1e3:.2f};desc="{self.queries} queries", app;dur={app_ms:.2f}'.encode()
+
+
+def redact(parameters, executemany: bool) -> str:
+    # Values kabhi log nahi hoti (passwords/hashes/emails), sirf unki types
+    if executemany:
+        return f"<{len(parameters)} parameter sets>"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    return "(" + ", ".join(type(value).__name__ for value in parameters or ()) + ")"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(statement, elapsed)
+    if elapsed * 1e3 >= settings.sql_slow_query_ms:
+        logger.warning("slow query %.1f ms: %s params=%s", elapsed * 1e3, " ".join(statement.split()),
+                       redact(parameters, executemany))
+
+
+def _handle_error(exception_context):
+    # Statement fail hua to after_cursor_execute nahi chalta, start time yahan hatao
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def install(engines):
+    # engines = database.ENGINES ki async engines (primary + replicas)
+    for async_engine in engines:
+        event.listen(async_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(async_engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(async_engine.sync_engine, "handle_error", _handle_error)
+
+
+class QueryProfilerMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+
+        async def send_with_timing(message):
+            # Header response start pe lagta hai; StreamingResponse ki baad wali queries isme nahi aati
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), (b"server-timing", profile.server_timing())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_profile.reset(token)
+            for statement, count in profile.repeated(settings.sql_repeat_threshold):
+                logger.warning("possible N+1: %d x %s on %s %s", count, " ".join(statement.split()),
+                               scope["method"], scope["path"])
@@ -0,0 +1,121 @@
+import math
+import time
+from collections import OrderedDict
+from fastapi import HTTPException
+from starlette import status
+from todoapp.config import settings
+from todoapp.todo_cache import FakeRedis
+
+
+# POST /auth/token ka rate limit: har attempt bcrypt verify (~300 ms CPU) hai, to credential
+# stuffing seedha CPU kha jati hai. Limit check DB lookup aur hashing se PEHLE hota hai.
+#
+# Sliding window counter: har key ke do counters (pichli aur maujooda window). Estimate =
+#   pichli * (window ka jo hissa abhi baqi overlap mein hai) + maujooda
+# Fixed window ki tarah window ki sarhad pe double burst nahi milta, aur memory sirf 2 numbers.
+# Rejected attempts bhi gine jate hain: block hone ke baad bhi hammer karne wala block hi rehta hai.
+#
+# Backends (LOGIN_RATE_LIMIT_BACKEND):
+#   memory    -> in-process (default); har worker ki apni ginti, multi-worker mein limit ~ workers x
+#   redis     -> Redis server (REDIS_URL), saare workers ek ginti share karte hain
+#   fakeredis -> Redis backend, local in-memory FakeRedis ke sath (tests / local)
+#   off       -> koi limit nahi
+
+
+class MemoryBackend:
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._windows = OrderedDict()  # key -> (window index, current count, previous count)
+
+    async def incr(self, key: str, window_index: int, ttl: int):
+        slot = self._windows.get(key)
+        if slot is None or slot[0] < window_index - 1:
+            current, previous = 1, 0
+        elif slot[0] == window_index - 1:
+            current, previous = 1, slot[1]
+        else:
+            current, previous = slot[1] + 1, slot[2]
+        self._windows[key] = (window_index, current, previous)
+        self._windows.move_to_end(key)
+        while len(self._windows) > self.max_keys:
+            self._windows.popitem(last=False)
+        return previous, current
+
+
+class RedisBackend:
+    # Keys: ratelimit:{name}:{key}:{window index} -> counter, do windows baad expire
+    def __init__(self, client):
+        self.client = client
+
+    async def incr(self, key: str, window_index: int, ttl: int):
+        current_key = f"ratelimit:{key}:{window_index}"
+        current = await self.client.incr(current_key)
+        if current == 1:
+            await self.client.expire(current_key, ttl)
+        previous = await self.client.get(f"ratelimit:{key}:{window_index - 1}")
+        return int(previous or 0), current
+
+
+class SlidingWindowLimiter:
+    def __init__(self, backend, name: str, limit: int, window: int):
+        self.backend = backend
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.allowed = 0
+        self.rejected = 0
+
+    async def hit(self, key: str) -> int:
+        # 0 -> allowed, warna kitne seconds baad dobara try karein (Retry-After)
+        window_index, offset = divmod(time.time(), self.window)
+        previous, current = await self.backend.incr(f"{self.name}:{key}", int(window_index), self.window * 2)
+        if previous * (1 - offset / self.window) + current <= self.limit:
+            self.allowed += 1
+            return 0
+        self.rejected += 1
+        return max(1, math.ceil(self.window - offset))
+
+    def stats(self) -> dict:
+        return {"limit": self.limit, "window_seconds": self.window, "allowed": self.allowed, "rejected": self.rejected}
+
+
+class LoginRateLimiter:
+    def __init__(self, backend):
+        self.backend = backend
+        self.by_ip = SlidingWindowLimiter(backend, "login:ip", settings.login_ip_limit, settings.login_ip_window)
+        self.by_username = SlidingWindowLimiter(
+            backend, "login:user", settings.login_username_limit, settings.login_username_window
+        )
+
+    async def check(self, ip: str, username: str):
+        if self.backend is None:
+            return
+        # IP pehle: blocked IP kisi username ka counter nahi barhata, taake ek IP se
+        # hammer karne wala asal user ko bhi lock out na kar de
+        retry_after = await self.by_ip.hit(ip or "unknown")
+        if not retry_after:
+            retry_after = await self.by_username.hit(username.strip().lower())
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, try again later",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+    def stats(self) -> dict:
+        return {"ip": self.by_ip.stats(), "username": self.by_username.stats()}
+
+
+def make_backend():
+    kind = settings.login_rate_limit_backend
+    if kind == "off":
+        return None
+    if kind == "redis":
+        import redis.asyncio
+        return RedisBackend(redis.asyncio.from_url(settings.redis_url))
+    if kind == "fakeredis":
+        return RedisBackend(FakeRedis())
+    return MemoryBackend(settings.login_rate_limit_max_keys)
+
+
+login_rate_limiter = LoginRateLimiter(make_backend())
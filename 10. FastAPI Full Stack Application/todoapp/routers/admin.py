@@ -1,9 +1,15 @@
-from typing import Annotated
-from sqlalchemy.orm import Session
-from fastapi import APIRouter, Depends, HTTPException, Path
+from typing import Annotated, List, Literal, Optional
+from sqlalchemy import select, delete
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
 from starlette import status
+from fastapi.responses import StreamingResponse
 from todoapp.models import Todo
-from todoapp.database import SessionLocal
+from todoapp.database import db_dependency, read_db_dependency
+from todoapp.schemas import TodoResponse
+from todoapp.etags import bump_todos_version
+from todoapp.todo_cache import todo_cache
+from todoapp.export import stream_todos, MEDIA_TYPES
+from todoapp.pagination import paginate, split_page, SortOption, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from .auth import get_current_user
 
 router = APIRouter(
@@ -11,21 +17,48 @@ router = APIRouter(
     tags=['admin']
 )
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-db_dependency = Annotated[Session, Depends(get_db)]
 user_dependency = Annotated[dict, Depends(get_current_user)]
 
-@router.get("/todo", status_code=status.HTTP_200_OK)
-async def read_all(user: user_dependency, db: db_dependency):
+@router.get("/todo", status_code=status.HTTP_200_OK, response_model=List[TodoResponse])
+async def read_all(user: user_dependency, db: read_db_dependency, response: Response,
+                   limit: int = Query(DEFAULT_PAGE_SIZE, gt=0, le=MAX_PAGE_SIZE),
+                   cursor: Optional[str] = None,
+                   complete: Optional[bool] = None,
+                   priority: Optional[int] = Query(None, gt=0, le=5),
+                   owner_id: Optional[int] = Query(None, gt=0),
+                   sort: SortOption = "id"):
+    if user is None or user.get('user_role') != 'admin':
+        raise HTTPException(status_code=401, detail="Authentication Failed")
+    stmt = select(Todo)
+    if owner_id is not None:
+        stmt = stmt.where(Todo.owner_id == owner_id)
+    if complete is not None:
+        stmt = stmt.where(Todo.complete == complete)
+    if priority is not None:
+        stmt = stmt.where(Todo.priority == priority)
+    result = await db.execute(paginate(stmt, sort, cursor, limit))
+    todos, next_cursor = split_page(result.scalars().all(), sort, limit)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return todos
+
+@router.get("/todo/export", status_code=status.HTTP_200_OK)
+async def export_todos(user: user_dependency,
+                       format: Literal["ndjson", "csv"] = "ndjson",
+                       complete: Optional[bool] = None,
+                       owner_id: Optional[int] = Query(None, gt=0)):
     if user is None or user.get('user_role') != 'admin':
         raise HTTPException(status_code=401, detail="Authentication Failed")
-    return db.query(Todo).all()
+    where = []
+    if owner_id is not None:
+        where.append(Todo.owner_id == owner_id)
+    if complete is not None:
+        where.append(Todo.complete == complete)
+    return StreamingResponse(
+        stream_todos(format, where),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="todos.{format}"'},
+    )
 
 @router.delete("/todo/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_todo(user: user_dependency,
@@ -34,9 +67,19 @@ async def delete_todo(user: user_dependency,
     if user is None or user.get('user_role') != 'admin':
         raise HTTPException(status_code=401, detail="Authentication Failed")
 
-    todo_model = db.query(Todo).filter(Todo.id == todo_id).first()
-    if todo_model is None:
+    # Owner ka version bump karna hai, to DELETE ... RETURNING owner_id -> ek hi round-trip.
+    # RETURNING na ho (MySQL) to pehle owner_id nikalna parta hai
+    stmt = delete(Todo).where(Todo.id == todo_id).execution_options(synchronize_session=False)
+    if db.bind.dialect.delete_returning:
+        row = (await db.execute(stmt.returning(Todo.owner_id))).first()
+    else:
+        row = (await db.execute(select(Todo.owner_id).where(Todo.id == todo_id))).first()
+        if row is not None:
+            await db.execute(stmt)
+    if row is None:
         raise HTTPException(status_code=404, detail="Todo not found")
 
-    db.query(Todo).filter(Todo.id == todo_id).delete()
-    db.commit()
+    owner_id = row.owner_id
+    await bump_todos_version(db, owner_id)
+    await db.commit()
+    await todo_cache.invalidate(owner_id)
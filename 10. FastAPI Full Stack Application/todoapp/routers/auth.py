@@ -1,10 +1,14 @@
-from fastapi import APIRouter,Depends,HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter,Depends,HTTPException,Request
+from sqlalchemy import select
 from typing import Annotated
 from pydantic import BaseModel
 from todoapp.models import Users
-from passlib.context import CryptContext
-from todoapp.database import SessionLocal
+from todoapp.schemas import UserResponse
+from todoapp.passwords import hash_password, verify_password
+from todoapp.database import db_dependency
+from todoapp.token_cache import token_cache
+from todoapp.rate_limit import login_rate_limiter
+from todoapp.metrics import JWT_SECONDS
 from starlette import status
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from jose import jwt, JWTError
@@ -15,24 +19,19 @@ router = APIRouter(
     tags=['auth']
 )
 
-def get_db():
-    try:
-        db = SessionLocal()
-        yield db
-    finally:
-        db.close()
-
-
-# 1) Annotated -> Python ko batata hai ke variable ka type kya hai (yahan Session)
+# db_dependency database.py mein define hai:
+# 1) Annotated -> Python ko batata hai ke variable ka type kya hai (yahan AsyncSession)
 # 2) Depends(get_db) -> FastAPI ko bolta hai ke database session get_db() se inject karo
 # 3) Matlab: jab bhi db_dependency use karoge, FastAPI tumhe ek database session dega
-db_dependency = Annotated[Session, Depends(get_db)]
 
 
 # Generate secret with: openssl rand -hex 32
 SECRET_KEY = "your-long-secret-string-here"
 ALGORITHM = "HS256"
 
+JWT_ENCODE_SECONDS = JWT_SECONDS.labels("encode")
+JWT_DECODE_SECONDS = JWT_SECONDS.labels("decode")
+
 
 class Token(BaseModel):
     access_token: str
@@ -52,12 +51,7 @@ class CreateUserRequest(BaseModel):
 
 
 
-# CryptContext ek class hai jo password hashing/verification ke liye use hoti hai
-# schemes=["bcrypt"] -> passwords ko bcrypt algorithm se hash karega
-# deprecated="auto" -> agar koi purani hashing scheme ho to usse outdated mark karega
-
-
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt_context ab todoapp/passwords.py mein hai, hash/verify wahan ke worker pool mein chalte hain
 
 
 # 👉 oauth2_bearer ek dependency hai jo har request se JWT token nikalne ka kaam karegi, aur FastAPI ko batayegi ke wo token kahan se aayega (yani /auth/token route se).
@@ -68,11 +62,12 @@ oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/token")
 
 
 # helper functions
-def authenticate_user(username: str, password: str, db):
-    user = db.query(Users).filter(Users.username == username).first()
+async def authenticate_user(username: str, password: str, db):
+    result = await db.execute(select(Users).where(Users.username == username))
+    user = result.scalars().first()
     if not user:
         return False
-    if not bcrypt_context.verify(password, user.hashed_password):
+    if not await verify_password(password, user.hashed_password):
         return False
     return user  # Return user object, not True
 
@@ -82,12 +77,18 @@ def create_access_token(username: str, user_id: int, role: str, expires_delta: t
     encode = {'sub': username, 'id': user_id, 'role': role}
     expire = datetime.now(timezone.utc) + expires_delta
     encode.update({'exp': expire})
-    return jwt.encode(encode, SECRET_KEY, algorithm=ALGORITHM)
+    with JWT_ENCODE_SECONDS.time():
+        return jwt.encode(encode, SECRET_KEY, algorithm=ALGORITHM)
   
 
 async def get_current_user(token: Annotated[str, Depends(oauth2_bearer)]):
+    # Same token dobara aaye to decode skip, claims cache se (token ke exp tak)
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        with JWT_DECODE_SECONDS.time():
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get('sub')
         user_id: int = payload.get('id')
         user_role: str = payload.get('role')
@@ -97,7 +98,10 @@ async def get_current_user(token: Annotated[str, Depends(oauth2_bearer)]):
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail='Could not validate credentials'
             )
-        return {'username': username, 'id': user_id, 'user_role': user_role}
+        claims = {'username': username, 'id': user_id, 'user_role': user_role}
+        if payload.get('exp') is not None:
+            token_cache.set(token, claims, payload['exp'])
+        return claims
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -112,7 +116,7 @@ async def get_user():
     return {"user": "authenticated"}
 
 
-@router.post("", status_code=status.HTTP_201_CREATED)
+@router.post("", status_code=status.HTTP_201_CREATED, response_model=UserResponse)
 async def create_user(db: db_dependency, create_user_request: CreateUserRequest):
     create_user_model = Users(
     email=create_user_request.email,
@@ -120,13 +124,13 @@ async def create_user(db: db_dependency, create_user_request: CreateUserRequest)
     first_name=create_user_request.first_name,
     last_name=create_user_request.last_name,
     role=create_user_request.role,
-    hashed_password = bcrypt_context.hash(create_user_request.password),
+    hashed_password = await hash_password(create_user_request.password),
     is_active=True,
     phone_number=create_user_request.phone_number   # <-- new field
 )
 
     db.add(create_user_model)
-    db.commit()
+    await db.commit()
 
     return create_user_model
 
@@ -135,9 +139,13 @@ async def create_user(db: db_dependency, create_user_request: CreateUserRequest)
 @router.post("/token", response_model=Token)
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
-    db: db_dependency
+    db: db_dependency,
+    request: Request
 ):
-    user = authenticate_user(form_data.username, form_data.password, db)
+    # Limit se upar -> 429, DB lookup aur bcrypt se pehle
+    # (proxy ke peeche ho to uvicorn --proxy-headers taake request.client asal IP ho)
+    await login_rate_limiter.check(request.client.host if request.client else None, form_data.username)
+    user = await authenticate_user(form_data.username, form_data.password, db)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
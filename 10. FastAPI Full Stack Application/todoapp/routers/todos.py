@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Path
-from typing import Annotated
-from sqlalchemy.orm import Session
-from todoapp.models import Todo
-from ..database import  SessionLocal
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Path, Query, Request, Response
+from typing import Annotated, List, Optional
+from sqlalchemy import select, insert, update, delete, bindparam
+from todoapp.models import Todo, Users
+from ..database import db_dependency, read_db_dependency
+from ..schemas import TodoResponse
+from ..etags import bump_todos_version, list_etag, item_etag, etag_matches, set_etag, not_modified, json_response
+from ..todo_cache import todo_cache
+from ..pagination import paginate, split_page, SortOption, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ..search import search_statement, MAX_SEARCH_RESULTS, SEARCH_DIALECTS
+from pydantic import BaseModel, Field, TypeAdapter
 from .auth import get_current_user
 
 router = APIRouter(
@@ -11,16 +16,7 @@ router = APIRouter(
     tags=['todos']
 )
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-# Create reusable dependency
-db_dependency = Annotated[Session, Depends(get_db)]
+# Create reusable dependency (db_dependency / read_db_dependency database.py mein hain)
 user_dependency = Annotated[dict, Depends(get_current_user)]
 
 class TodoRequest(BaseModel):
@@ -29,11 +25,87 @@ class TodoRequest(BaseModel):
     completed: bool   
     priority: int = Field(gt=0, le=5)  # Add priority field
 
-@router.get("/")
-async def read_all(user: user_dependency, db: db_dependency):
+
+# Bulk endpoints ek request mein itne items tak lete hain
+MAX_BULK_ITEMS = 500
+
+
+class TodoBulkUpdateRequest(TodoRequest):
+    id: int = Field(gt=0)
+
+
+# List response ko khud JSON bytes mein badalte hain taake wahi bytes cache mein ja sakein
+todo_list_adapter = TypeAdapter(List[TodoResponse])
+
+@router.get("/", response_model=List[TodoResponse])
+async def read_all(user: user_dependency, db: read_db_dependency, request: Request, response: Response,
+                   limit: int = Query(DEFAULT_PAGE_SIZE, gt=0, le=MAX_PAGE_SIZE),
+                   cursor: Optional[str] = None,
+                   complete: Optional[bool] = None,
+                   priority: Optional[int] = Query(None, gt=0, le=5),
+                   sort: SortOption = "id"):
     if user is None:
       raise HTTPException(status_code=401, detail="Authentication Failed")
-    return db.query(Todo).filter(Todo.owner_id == user.get('id')).all()
+
+    owner_id = user.get('id')
+    query = request.url.query
+
+    # Cache hit -> database ko haath hi nahi lagta
+    generation = None
+    if todo_cache.enabled:
+        generation = await todo_cache.generation(owner_id)
+        cached = await todo_cache.get(owner_id, generation, query)
+        if cached is not None:
+            etag, next_cursor, body = cached
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            return json_response(body, etag, {"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+    # Pehle sirf version (PK lookup); client ke paas yehi version ho to 304, todos query hi nahi hoti
+    result = await db.execute(select(Users.todos_version).where(Users.id == owner_id))
+    version = result.scalar()
+    etag = None
+    if version is not None:
+        etag = list_etag(owner_id, version, query)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+    stmt = select(Todo).where(Todo.owner_id == owner_id)
+    if complete is not None:
+        stmt = stmt.where(Todo.complete == complete)
+    if priority is not None:
+        stmt = stmt.where(Todo.priority == priority)
+    result = await db.execute(paginate(stmt, sort, cursor, limit))
+    todos, next_cursor = split_page(result.scalars().all(), sort, limit)
+    if etag is None:
+        # User row hi nahi (version nahi) -> na ETag na cache
+        if next_cursor is not None:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return todos
+
+    body = todo_list_adapter.dump_json(todo_list_adapter.validate_python(todos, from_attributes=True))
+    if generation is not None:
+        await todo_cache.set(owner_id, generation, query, etag, next_cursor, body)
+    # Agla page mangne ke liye client ye cursor wapas bheje (?cursor=...)
+    return json_response(body, etag, {"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+
+@router.get("/search", status_code=status.HTTP_200_OK, response_model=List[TodoResponse])
+async def search_todos(user: user_dependency, db: read_db_dependency,
+                       q: str = Query(min_length=1, max_length=200),
+                       limit: int = Query(20, gt=0, le=MAX_SEARCH_RESULTS)):
+    if user is None:
+        raise HTTPException(status_code=401, detail="Authentication Failed")
+    # Full-text index se ranked results (best match pehle), dekho todoapp/search.py
+    dialect_name = db.bind.dialect.name
+    if dialect_name not in SEARCH_DIALECTS:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                            detail=f"Search is not available on {dialect_name}")
+    stmt = search_statement(dialect_name, user.get('id'), q, limit)
+    if stmt is None:
+        return []
+    result = await db.execute(stmt)
+    return result.scalars().all()
 
 
 
@@ -46,16 +118,29 @@ async def read_all(user: user_dependency, db: db_dependency):
 #         raise HTTPException(status_code=404, detail="No todos found")
 #     return todos
 
-@router.get("/todo/{todo_id}", status_code=status.HTTP_200_OK)
-async def read_todo(user: user_dependency,db: db_dependency, todo_id: int = Path(gt=0)):
+@router.get("/todo/{todo_id}", status_code=status.HTTP_200_OK, response_model=TodoResponse)
+async def read_todo(user: user_dependency,db: read_db_dependency, request: Request, response: Response,
+                    todo_id: int = Path(gt=0)):
     if user is None:
       raise HTTPException(status_code=401, detail="Authentication Failed")
-    todo_model = db.query(Todo).filter(Todo.id == todo_id).filter(Todo.owner_id == user.get('id')).first()
+    if request.headers.get("if-none-match"):
+        result = await db.execute(
+            select(Todo.version).where(Todo.id == todo_id).where(Todo.owner_id == user.get('id'))
+        )
+        version = result.scalar()
+        if version is not None and etag_matches(request, item_etag(todo_id, version)):
+            return not_modified(item_etag(todo_id, version))
+
+    result = await db.execute(
+        select(Todo).where(Todo.id == todo_id).where(Todo.owner_id == user.get('id'))
+    )
+    todo_model = result.scalars().first()
     if todo_model is not None:
+        set_etag(response, item_etag(todo_model.id, todo_model.version))
         return todo_model
     raise HTTPException(status_code=404, detail="Todo not found")
 
-@router.post("/todo", status_code=status.HTTP_201_CREATED)
+@router.post("/todo", status_code=status.HTTP_201_CREATED, response_model=TodoResponse)
 async def create_todo(user: user_dependency,
                      todo_request: TodoRequest,
                      db: db_dependency):
@@ -70,43 +155,183 @@ async def create_todo(user: user_dependency,
         owner_id=user.get('id')  # You'll want to get this from authentication later
     )
     db.add(todo_model)
-    db.commit()
-    db.refresh(todo_model)  
+    await bump_todos_version(db, user.get('id'))
+    await db.commit()
+    await todo_cache.invalidate(user.get('id'))
+    # refresh ki zaroorat nahi: id INSERT se hi mil jati hai, baqi fields (version default samet)
+    # object pe pehle se hain aur expire_on_commit=False hai
     return todo_model
 
+
+async def execute_owned(db, stmt) -> bool:
+    # Single UPDATE/DELETE; True agar koi row match hui.
+    # RETURNING wale dialects (SQLite 3.35+, Postgres) pe usi statement se pata chalta hai,
+    # baqi (MySQL) pe rowcount se (MySQL dialect FOUND_ROWS flag lagata hai, to matched rows)
+    stmt = stmt.execution_options(synchronize_session=False)
+    dialect = db.bind.dialect
+    if dialect.delete_returning if stmt.is_delete else dialect.update_returning:
+        result = await db.execute(stmt.returning(Todo.id))
+        return result.first() is not None
+    result = await db.execute(stmt)
+    return result.rowcount > 0
+
 @router.put("/todo/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def update_todo(user: user_dependency,db: db_dependency, todo_request: TodoRequest, todo_id: int = Path(gt=0)):
     if user is None:
       raise HTTPException(status_code=401, detail="Authentication Failed")
 
 
-
-    todo_model = db.query(Todo).filter(Todo.id == todo_id).filter(Todo.owner_id == user.get('id')).first()
-    if todo_model is None:
+    # Pehle SELECT phir UPDATE ki jagah ek hi UPDATE ... WHERE id AND owner_id
+    updated = await execute_owned(
+        db,
+        update(Todo)
+        .where(Todo.id == todo_id)
+        .where(Todo.owner_id == user.get('id'))
+        .values(
+            title=todo_request.title,
+            description=todo_request.description,
+            complete=todo_request.completed,
+            priority=todo_request.priority,
+            version=Todo.version + 1,
+        ),
+    )
+    if not updated:
         raise HTTPException(status_code=404, detail="Todo not found")
 
-    todo_model.title = todo_request.title
-    todo_model.description = todo_request.description
-    todo_model.complete = todo_request.completed  
-    todo_model.priority = todo_request.priority
-
-    db.add(todo_model)
-    db.commit()
+    await bump_todos_version(db, user.get('id'))
+    await db.commit()
+    await todo_cache.invalidate(user.get('id'))
 
 @router.delete("/todo/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_todo(user:user_dependency,db: db_dependency, todo_id: int = Path(gt=0)):
     if user is None:
         raise HTTPException(status_code=404,detail="Authenticated failed")
-    todo_model = db.query(Todo).filter(Todo.id == todo_id).filter(Todo.owner_id == user.get('id')).first()
-    if todo_model is None:
+    deleted = await execute_owned(
+        db, delete(Todo).where(Todo.id == todo_id).where(Todo.owner_id == user.get('id'))
+    )
+    if not deleted:
         raise HTTPException(status_code=404, detail="Todo not found")
 
-    db.delete(todo_model)
-    db.commit()
+    await bump_todos_version(db, user.get('id'))
+    await db.commit()
+    await todo_cache.invalidate(user.get('id'))
+
+
 
+# ---------------- Bulk endpoints ----------------
+# Sync karne wale clients har todo ke liye alag request bhejne ki jagah
+# poori list ek request mein bhejte hain: ek transaction, ek commit.
 
+async def owned_todo_ids(db, owner_id: int, ids) -> set:
+    result = await db.execute(
+        select(Todo.id).where(Todo.owner_id == owner_id).where(Todo.id.in_(ids))
+    )
+    return set(result.scalars().all())
+
+
+@router.post("/bulk", status_code=status.HTTP_201_CREATED)
+async def create_todos_bulk(user: user_dependency, db: db_dependency,
+                            todo_requests: List[TodoRequest] = Body(min_length=1, max_length=MAX_BULK_ITEMS)):
+    if user is None:
+        raise HTTPException(status_code=401, detail="Authentication Failed")
 
+    rows = [
+        {
+            "title": todo_request.title,
+            "description": todo_request.description,
+            "complete": todo_request.completed,
+            "priority": todo_request.priority,
+            "owner_id": user.get('id'),
+        }
+        for todo_request in todo_requests
+    ]
+    if db.bind.dialect.insert_executemany_returning_sort_by_parameter_order:
+        # Ek multi-row INSERT ... RETURNING id, ids usi order mein jis mein rows bheji
+        result = await db.execute(
+            insert(Todo).returning(Todo.id, sort_by_parameter_order=True), rows
+        )
+        ids = result.scalars().all()
+    else:
+        todo_models = [Todo(**row) for row in rows]
+        db.add_all(todo_models)
+        await db.flush()
+        ids = [todo_model.id for todo_model in todo_models]
+    await bump_todos_version(db, user.get('id'))
+    await db.commit()
+    await todo_cache.invalidate(user.get('id'))
 
+    return [{"index": index, "id": todo_id, "status": "created"} for index, todo_id in enumerate(ids)]
 
 
+@router.put("/bulk", status_code=status.HTTP_200_OK)
+async def update_todos_bulk(user: user_dependency, db: db_dependency,
+                            todo_requests: List[TodoBulkUpdateRequest] = Body(min_length=1, max_length=MAX_BULK_ITEMS)):
+    if user is None:
+        raise HTTPException(status_code=401, detail="Authentication Failed")
+
+    owned = await owned_todo_ids(db, user.get('id'), {todo_request.id for todo_request in todo_requests})
+    params = [
+        {
+            "b_id": todo_request.id,
+            "b_title": todo_request.title,
+            "b_description": todo_request.description,
+            "b_complete": todo_request.completed,
+            "b_priority": todo_request.priority,
+        }
+        for todo_request in todo_requests
+        if todo_request.id in owned
+    ]
+    if params:
+        # Ek UPDATE statement, executemany ke sath saari rows
+        table = Todo.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .where(table.c.owner_id == user.get('id'))
+            .values(
+                title=bindparam("b_title"),
+                description=bindparam("b_description"),
+                complete=bindparam("b_complete"),
+                priority=bindparam("b_priority"),
+                version=table.c.version + 1,
+            )
+        )
+        await db.execute(stmt, params)
+        await bump_todos_version(db, user.get('id'))
+    await db.commit()
+    if params:
+        await todo_cache.invalidate(user.get('id'))
+
+    return [
+        {"id": todo_request.id, "status": "updated" if todo_request.id in owned else "not_found"}
+        for todo_request in todo_requests
+    ]
+
+
+@router.delete("/bulk", status_code=status.HTTP_200_OK)
+async def delete_todos_bulk(user: user_dependency, db: db_dependency,
+                            ids: List[int] = Query(min_length=1, max_length=MAX_BULK_ITEMS)):
+    if user is None:
+        raise HTTPException(status_code=401, detail="Authentication Failed")
+
+    stmt = (
+        delete(Todo)
+        .where(Todo.owner_id == user.get('id'))
+        .where(Todo.id.in_(set(ids)))
+        .execution_options(synchronize_session=False)
+    )
+    if db.bind.dialect.delete_returning:
+        # DELETE ... RETURNING id -> kaunse delete hue wo bhi isi statement se
+        result = await db.execute(stmt.returning(Todo.id))
+        owned = set(result.scalars().all())
+    else:
+        owned = await owned_todo_ids(db, user.get('id'), set(ids))
+        if owned:
+            await db.execute(stmt)
+    if owned:
+        await bump_todos_version(db, user.get('id'))
+    await db.commit()
+    if owned:
+        await todo_cache.invalidate(user.get('id'))
 
+    return [{"id": todo_id, "status": "deleted" if todo_id in owned else "not_found"} for todo_id in ids]
@@ -1,38 +1,31 @@
 from typing import Annotated
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 from fastapi import APIRouter, Depends, HTTPException
 from starlette import status
 from todoapp.models import Users
-from todoapp.database import SessionLocal
+from todoapp.database import db_dependency, read_db_dependency
+from todoapp.schemas import UserResponse
 from .auth import get_current_user
-from passlib.context import CryptContext
+from todoapp.passwords import verify_password, hash_password
 
 router = APIRouter(
     prefix='/api/user',
     tags=['user']
 )
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-db_dependency = Annotated[Session, Depends(get_db)]
 user_dependency = Annotated[dict, Depends(get_current_user)]
-bcrypt_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
 
 class UserVerification(BaseModel):
     password: str
     new_password: str = Field(min_length=6)
 
-@router.get("/", status_code=status.HTTP_200_OK)
-async def get_user(user: user_dependency, db: db_dependency):
+@router.get("/", status_code=status.HTTP_200_OK, response_model=UserResponse)
+async def get_user(user: user_dependency, db: read_db_dependency):
     if user is None:
         raise HTTPException(status_code=401, detail="Authentication Failed")
-    return db.query(Users).filter(Users.id == user.get('id')).first()
+    result = await db.execute(select(Users).where(Users.id == user.get('id')))
+    return result.scalars().first()
 
 @router.put("/password", status_code=status.HTTP_204_NO_CONTENT)
 async def change_password(user: user_dependency,
@@ -41,14 +34,15 @@ async def change_password(user: user_dependency,
     if user is None:
         raise HTTPException(status_code=401, detail="Authentication Failed")
 
-    user_model = db.query(Users).filter(Users.id == user.get('id')).first()
+    result = await db.execute(select(Users).where(Users.id == user.get('id')))
+    user_model = result.scalars().first()
 
-    if not bcrypt_context.verify(user_verification.password, user_model.hashed_password):
+    if not await verify_password(user_verification.password, user_model.hashed_password):
         raise HTTPException(status_code=401, detail="Error on password change")
 
-    user_model.hashed_password = bcrypt_context.hash(user_verification.new_password)
+    user_model.hashed_password = await hash_password(user_verification.new_password)
     db.add(user_model)
-    db.commit()
+    await db.commit()
 
 
 
@@ -57,6 +51,7 @@ async def change_phone_number(user: user_dependency, db: db_dependency, phone_nu
     if user is None:
         raise HTTPException(status_code=401, detail='Authentication Failed')
 
-    user_model = db.query(Users).filter(Users.id == user.get('id')).first()
+    result = await db.execute(select(Users).where(Users.id == user.get('id')))
+    user_model = result.scalars().first()
     user_model.phone_number = phone_number
-    db.commit()
+    await db.commit()
@@ -0,0 +1,31 @@
+from typing import Optional
+from pydantic import BaseModel, ConfigDict
+
+
+# Response models: routers SQLAlchemy objects return karte hain, from_attributes=True
+# ki wajah se Pydantic unhe seedha in models mein convert (aur JSON) karta hai.
+# Sirf yahan likhe fields bahar jate hain (hashed_password kabhi response mein nahi jata).
+# Jo columns nullable hain woh yahan bhi Optional: ek NULL row poori list ko 500 na bana de.
+
+class TodoResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    complete: Optional[bool] = None
+    priority: Optional[int] = None
+    owner_id: Optional[int] = None
+
+
+class UserResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    email: Optional[str] = None
+    username: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    role: Optional[str] = None
+    is_active: Optional[bool] = None
+    phone_number: Optional[str] = None
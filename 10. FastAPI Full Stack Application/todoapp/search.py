@@ -0,0 +1,120 @@
+import re
+from typing import Optional
+from sqlalchemy import DDL, event, func, literal_column, select, table, column
+from sqlalchemy.dialects.mysql import match as mysql_match
+from todoapp.models import Todo
+
+
+# Todo title/description pe full-text search, har database ka apna index:
+#   sqlite     -> FTS5 virtual table todos_fts (external content = todos), triggers se sync
+#   postgresql -> generated tsvector column todos.search + GIN index
+#   mysql      -> FULLTEXT index (title, description)
+# Alembic revision 5d2f8a61c3b7 yahi schema banati hai; khali DB pe create_all ke baad
+# neeche wale after_create hooks wahi DDL chalate hain.
+#
+# SQLite mein owner_id bhi FTS column hai: "owner_id:7 AND ..." se FTS index khud hi sirf us
+# user ki rows deta hai, warna har user ke matches nikal ke baad mein filter karne parte.
+# prefix='2 3': aakhri word prefix query ("mil"*) hota hai; iske baghair FTS5 har matching
+# term ki doclist merge karta hai (common prefixes pe p99 ~100x kharab).
+SEARCH_DDL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE todos_fts USING fts5("
+        "title, description, owner_id, content='todos', content_rowid='id', "
+        "tokenize='porter unicode61 remove_diacritics 2', prefix='2 3')",
+        "CREATE TRIGGER todos_fts_ai AFTER INSERT ON todos BEGIN "
+        "INSERT INTO todos_fts(rowid, title, description, owner_id) "
+        "VALUES (new.id, new.title, new.description, new.owner_id); END",
+        "CREATE TRIGGER todos_fts_ad AFTER DELETE ON todos BEGIN "
+        "INSERT INTO todos_fts(todos_fts, rowid, title, description, owner_id) "
+        "VALUES ('delete', old.id, old.title, old.description, old.owner_id); END",
+        "CREATE TRIGGER todos_fts_au AFTER UPDATE OF title, description, owner_id ON todos BEGIN "
+        "INSERT INTO todos_fts(todos_fts, rowid, title, description, owner_id) "
+        "VALUES ('delete', old.id, old.title, old.description, old.owner_id); "
+        "INSERT INTO todos_fts(rowid, title, description, owner_id) "
+        "VALUES (new.id, new.title, new.description, new.owner_id); END",
+    ],
+    "postgresql": [
+        "ALTER TABLE todos ADD COLUMN search tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')) STORED",
+        "CREATE INDEX ix_todos_search ON todos USING GIN (search)",
+    ],
+    "mysql": [
+        "CREATE FULLTEXT INDEX ix_todos_fulltext ON todos (title, description)",
+    ],
+}
+
+for dialect_name, statements in SEARCH_DDL.items():
+    for statement in statements:
+        event.listen(Todo.__table__, "after_create", DDL(statement).execute_if(dialect=dialect_name))
+
+# Upar wale DDL ke objects jo models/metadata mein nahi hain. alembic/env.py inhein autogenerate
+# se bahar rakhta hai, warna `alembic check` / `revision --autogenerate` inhein drop karna chahta.
+# (todos_fts_* FTS5 ki apni shadow tables hain)
+SEARCH_TABLES = {"todos_fts", "todos_fts_data", "todos_fts_idx", "todos_fts_docsize", "todos_fts_config"}
+SEARCH_INDEXES = {"ix_todos_search", "ix_todos_fulltext"}
+SEARCH_COLUMNS = {("todos", "search")}
+
+
+def is_search_object(obj, name, type_) -> bool:
+    if type_ == "table":
+        return name in SEARCH_TABLES
+    if type_ == "index":
+        return name in SEARCH_INDEXES
+    if type_ == "column":
+        return (obj.table.name, name) in SEARCH_COLUMNS
+    return False
+
+
+MAX_SEARCH_RESULTS = 100
+# Jin databases ke liye upar index aur neeche query hai; baqi pe route 501 deta hai
+SEARCH_DIALECTS = ("sqlite", "postgresql", "mysql", "mariadb")
+# bm25 weights: title ka match description se zyada, owner_id ranking mein shamil nahi
+BM25_WEIGHTS = (10.0, 1.0, 0.0)
+
+todos_fts = table("todos_fts", column("rowid"))
+_fts = literal_column("todos_fts")
+_search_vector = literal_column("todos.search")
+
+
+def fts_query(owner_id: int, q: str) -> Optional[str]:
+    # User ka text FTS5 syntax mein kabhi seedha nahi jata (quotes/operators se syntax error aata);
+    # sirf words, har ek quoted, sab AND, aakhri word prefix (type karte karte search)
+    words = re.findall(r"\w+", q)
+    if not words:
+        return None
+    terms = " AND ".join(f'"{word}"' for word in words) + "*"
+    return f'owner_id:"{owner_id}" AND {{title description}}: ({terms})'
+
+
+def search_statement(dialect_name: str, owner_id: int, q: str, limit: int):
+    if dialect_name == "sqlite":
+        match = fts_query(owner_id, q)
+        if match is None:
+            return None
+        return (
+            select(Todo)
+            .join(todos_fts, todos_fts.c.rowid == Todo.id)
+            .where(_fts.op("MATCH")(match))
+            .order_by(func.bm25(_fts, *BM25_WEIGHTS))
+            .limit(limit)
+        )
+    if dialect_name == "postgresql":
+        query = func.websearch_to_tsquery("english", q)
+        return (
+            select(Todo)
+            .where(Todo.owner_id == owner_id)
+            .where(_search_vector.op("@@")(query))
+            .order_by(func.ts_rank(_search_vector, query).desc(), Todo.id)
+            .limit(limit)
+        )
+    if dialect_name in ("mysql", "mariadb"):
+        score = mysql_match(Todo.title, Todo.description, against=q).in_natural_language_mode()
+        return (
+            select(Todo)
+            .where(Todo.owner_id == owner_id)
+            .where(score > 0)
+            .order_by(score.desc(), Todo.id)
+            .limit(limit)
+        )
+    raise NotImplementedError(f"full-text search is not set up for {dialect_name}")
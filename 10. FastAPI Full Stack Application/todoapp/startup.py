@@ -0,0 +1,128 @@
+import asyncio
+import os
+from contextlib import AsyncExitStack, asynccontextmanager
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import exc, inspect, select, text, update, delete
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from todoapp.config import settings
+from todoapp.database import Base, ENGINES, AsyncSessionLocal, async_engine, replica_router
+from todoapp.models import Todo, Users
+from todoapp.etags import bump_todos_version
+from todoapp.pagination import paginate, encode_cursor, SORT_OPTIONS, DEFAULT_PAGE_SIZE
+from todoapp.passwords import password_pool
+from todoapp.routers.todos import execute_owned
+
+
+# Worker start hone pe (lifespan) ek baar:
+#   1. schema check   -> alembic_version == head? (ek SELECT, koi reflection nahi)
+#   2. pool warm-up   -> DB_POOL_WARM connections pehle se khol lo (TLS/auth/PRAGMA ka kharcha boot pe)
+#   3. precompile     -> hot statements ek dafa chala ke SQLAlchemy ka compiled cache bhar do
+# Pehle har import pe create_all chalta tha (har table ki reflection) aur alembic se alag schema banata tha.
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+
+def alembic_head() -> str:
+    return ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_current_head()
+
+
+def stamp_head(connection):
+    MigrationContext.configure(connection).stamp(ScriptDirectory.from_config(Config(ALEMBIC_INI)), "head")
+
+
+def _create_or_fail(connection, head: str) -> str:
+    # Slow path (sync, run_sync ke andar): alembic_version nahi mila ya purana hai
+    current = MigrationContext.configure(connection).get_current_revision()
+    if current == head:
+        return "current"
+    if current is None and not inspect(connection).get_table_names():
+        # Bilkul khali database (naya dev setup) -> models se tables aur alembic stamp
+        Base.metadata.create_all(connection)
+        stamp_head(connection)
+        return "created"
+    raise RuntimeError(
+        f"Database schema revision is {current!r} but the code expects {head!r}; run `alembic upgrade head` "
+        "(or start with SCHEMA_STARTUP=upgrade)"
+    )
+
+
+async def prepare_schema() -> str:
+    mode = settings.schema_startup
+    if mode == "off":
+        return "skipped"
+    if mode == "upgrade":
+        # Migrations sync alembic env.py se, thread mein taake event loop block na ho
+        await asyncio.to_thread(command.upgrade, Config(ALEMBIC_INI), "head")
+
+    head = alembic_head()
+    # Fast path: sirf version row parho
+    try:
+        async with async_engine.connect() as conn:
+            current = (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar()
+        if current == head:
+            return "current"
+    except exc.DBAPIError:
+        pass  # table hi nahi hai
+    async with async_engine.begin() as conn:
+        return await conn.run_sync(_create_or_fail, head)
+
+
+async def warm_pool(engine, size: int):
+    # Ek saath size connections pakar ke chhor do -> sab pool mein idle pari rehti hain
+    if not isinstance(engine.pool, AsyncAdaptedQueuePool):
+        return
+    async with AsyncExitStack() as stack:
+        for _ in range(min(size, engine.pool.size())):
+            await stack.enter_async_context(engine.connect())
+
+
+def hot_reads():
+    # Wahi statements jo routers chalate hain (values se farq nahi parta, wo bind params hain)
+    yield select(Users).where(Users.username == "")                                   # login
+    yield select(Users).where(Users.id == 0)                                          # /api/user
+    yield select(Users.todos_version).where(Users.id == 0)                            # list ETag
+    yield select(Todo.version).where(Todo.id == 0).where(Todo.owner_id == 0)          # If-None-Match
+    yield select(Todo).where(Todo.id == 0).where(Todo.owner_id == 0)                  # GET /todo/{id}
+    for sort in SORT_OPTIONS:                                                         # GET /api/todos/
+        cursor = encode_cursor(Todo(id=0, priority=1), sort)
+        yield paginate(select(Todo).where(Todo.owner_id == 0), sort, None, DEFAULT_PAGE_SIZE)
+        yield paginate(select(Todo).where(Todo.owner_id == 0), sort, cursor, DEFAULT_PAGE_SIZE)
+
+
+async def precompile(sessionmaker, writes: bool):
+    async with sessionmaker() as db:
+        for stmt in hot_reads():
+            await db.execute(stmt)
+        if writes:
+            # id 0 kabhi match nahi hota, aur transaction rollback hoti hai
+            await execute_owned(db, update(Todo).where(Todo.id == 0).where(Todo.owner_id == 0).values(
+                title="", description="", complete=False, priority=1, version=Todo.version + 1,
+            ))
+            await execute_owned(db, delete(Todo).where(Todo.id == 0).where(Todo.owner_id == 0))
+            await bump_todos_version(db, 0)
+        await db.rollback()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    await prepare_schema()
+    primary_engine, _ = ENGINES["primary"]
+    if settings.db_pool_warm:
+        await warm_pool(primary_engine, settings.db_pool_warm)
+    if settings.precompile_statements:
+        await precompile(AsyncSessionLocal, writes=True)
+    for replica in replica_router.replicas:
+        # Replica down ho to boot na ruke; health check baad mein dobara try karega
+        try:
+            if settings.db_pool_warm:
+                await warm_pool(replica.engine, settings.db_pool_warm)
+            if settings.precompile_statements:
+                await precompile(replica.sessionmaker, writes=False)
+        except (exc.DBAPIError, OSError):
+            replica.healthy = False
+    yield
+    password_pool.shutdown()
+    for engine, _ in ENGINES.values():
+        await engine.dispose()
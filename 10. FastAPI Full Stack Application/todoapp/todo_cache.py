@@ -0,0 +1,171 @@
+import time
+from collections import OrderedDict
+from todoapp.config import settings
+
+
+# GET /api/todos/ ka per-user cache.
+#
+# Har owner ki ek "generation" hoti hai. Cache entries (owner, generation, query string) pe
+# rakhi jati hain, aur har mutating route commit ke BAAD invalidate(owner) call karta hai jo
+# generation +1 kar deta hai. Is tarah purani entries khud hi bekaar ho jati hain, aur agar
+# koi read write ke dauran purana data cache karne lage to wo purani generation mein jata hai.
+#
+# Backends (TODO_CACHE_BACKEND):
+#   memory    -> in-process LRU (default); har worker ka apna, multi-worker deploy mein redis lo
+#   redis     -> Redis server (REDIS_URL), saare workers ek cache share karte hain
+#   fakeredis -> Redis backend, lekin local in-memory FakeRedis client ke sath (tests / local)
+#   off       -> cache band
+
+
+class MemoryBackend:
+    def __init__(self, max_owners: int, ttl: float):
+        self.max_owners = max_owners
+        self.ttl = ttl
+        self._generations = {}
+        self._entries = OrderedDict()  # owner -> (generation, {query: (expires_at, value)})
+
+    async def generation(self, owner_id: int) -> int:
+        return self._generations.get(owner_id, 0)
+
+    async def get(self, owner_id: int, generation: int, query: str):
+        slot = self._entries.get(owner_id)
+        if slot is None or slot[0] != generation:
+            return None
+        entry = slot[1].get(query)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        self._entries.move_to_end(owner_id)
+        return entry[1]
+
+    async def set(self, owner_id: int, generation: int, query: str, value: bytes):
+        if self._generations.get(owner_id, 0) != generation:
+            return
+        slot = self._entries.get(owner_id)
+        if slot is None or slot[0] != generation:
+            slot = (generation, {})
+            self._entries[owner_id] = slot
+        slot[1][query] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(owner_id)
+        while len(self._entries) > self.max_owners:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, owner_id: int):
+        self._generations[owner_id] = self._generations.get(owner_id, 0) + 1
+        self._entries.pop(owner_id, None)
+
+
+class RedisBackend:
+    # Keys: todos:gen:{owner} -> generation counter, todos:{owner}:{generation} -> hash(query -> value)
+    def __init__(self, client, ttl: int):
+        self.client = client
+        self.ttl = ttl
+
+    async def generation(self, owner_id: int) -> int:
+        value = await self.client.get(f"todos:gen:{owner_id}")
+        return int(value) if value is not None else 0
+
+    async def get(self, owner_id: int, generation: int, query: str):
+        return await self.client.hget(f"todos:{owner_id}:{generation}", query)
+
+    async def set(self, owner_id: int, generation: int, query: str, value: bytes):
+        key = f"todos:{owner_id}:{generation}"
+        await self.client.hset(key, query, value)
+        await self.client.expire(key, self.ttl)
+
+    async def invalidate(self, owner_id: int):
+        # Purani generation ka hash TTL se khud expire ho jata hai
+        await self.client.incr(f"todos:gen:{owner_id}")
+
+
+class FakeRedis:
+    # Redis ke sirf wo commands jo RedisBackend use karta hai, memory mein
+    def __init__(self):
+        self._data = {}
+        self._expires = {}
+
+    def _alive(self, key):
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    async def get(self, key):
+        return self._data[key] if self._alive(key) else None
+
+    async def incr(self, key):
+        value = int(self._data[key]) + 1 if self._alive(key) else 1
+        self._data[key] = str(value).encode()
+        return value
+
+    async def hget(self, key, field):
+        return self._data[key].get(field) if self._alive(key) else None
+
+    async def hset(self, key, field, value):
+        if not self._alive(key):
+            self._data[key] = {}
+        self._data[key][field] = value
+
+    async def expire(self, key, seconds):
+        if self._alive(key):
+            self._expires[key] = time.monotonic() + seconds
+
+
+class TodoListCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def generation(self, owner_id: int) -> int:
+        return await self.backend.generation(owner_id)
+
+    # Entry = ETag, next cursor aur JSON body; newline se jore hain (ETag/cursor mein newline nahi hoti)
+    async def get(self, owner_id: int, generation: int, query: str):
+        value = await self.backend.get(owner_id, generation, query)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        etag, next_cursor, body = value.split(b"\n", 2)
+        return etag.decode(), next_cursor.decode() or None, body
+
+    async def set(self, owner_id: int, generation: int, query: str, etag: str, next_cursor, body: bytes):
+        value = b"\n".join([etag.encode(), (next_cursor or "").encode(), body])
+        await self.backend.set(owner_id, generation, query, value)
+
+    async def invalidate(self, owner_id: int):
+        if self.backend is None:
+            return
+        self.invalidations += 1
+        await self.backend.invalidate(owner_id)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+def make_backend():
+    kind = settings.todo_cache_backend
+    if kind == "off":
+        return None
+    if kind == "redis":
+        import redis.asyncio
+        return RedisBackend(redis.asyncio.from_url(settings.redis_url), settings.todo_cache_ttl)
+    if kind == "fakeredis":
+        return RedisBackend(FakeRedis(), settings.todo_cache_ttl)
+    return MemoryBackend(settings.todo_cache_max_owners, settings.todo_cache_ttl)
+
+
+todo_cache = TodoListCache(make_backend())
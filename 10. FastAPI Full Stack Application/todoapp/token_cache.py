@@ -0,0 +1,64 @@
+import hashlib
+import time
+from collections import OrderedDict
+from todoapp.config import settings
+
+
+# Har request pe jwt.decode (HMAC + JSON parse + exp check) dobara na chale,
+# is liye decoded claims token ke exp tak yahan rakhe jate hain
+# (JWT_CACHE_ENABLED=0 se band, JWT_CACHE_SIZE = LRU size; dekho config.py).
+
+
+class TokenCache:
+    def __init__(self, max_size: int, enabled: bool = True):
+        self.max_size = max_size
+        self.enabled = enabled
+        self._entries = OrderedDict()  # digest -> (expires_at, claims)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        # Raw token memory mein nahi rakhte, sirf uska digest
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str):
+        if not self.enabled:
+            return None
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, claims = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return claims
+
+    def set(self, token: str, claims: dict, expires_at: float):
+        if not self.enabled or expires_at <= time.time():
+            return
+        key = self._key(token)
+        self._entries[key] = (expires_at, claims)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+token_cache = TokenCache(settings.jwt_cache_size, settings.jwt_cache_enabled)